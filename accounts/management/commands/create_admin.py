@@ -3,6 +3,7 @@ from getpass import getpass
 from django.core.management.base import BaseCommand, CommandError
 
 from accounts.models import User
+from kyc.services import counters
 
 
 class Command(BaseCommand):
@@ -79,6 +80,7 @@ class Command(BaseCommand):
                 )
             else:
                 user = User.objects.create_user(**create_kwargs)
+            counters.bump("users", tenant=user.tenant_id)
             action = "created"
 
         self.stdout.write(
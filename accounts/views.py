@@ -7,10 +7,19 @@ from django.shortcuts import redirect, render
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 
+from kyc.services.warmup import is_ready, warmup_status
+
 from .forms import UnifiedLoginForm
 
 
 def health_check(request):
+    # Report not-ready while this worker is still loading face models (or could
+    # not load them), so traffic is only routed to it once verification works.
+    if not is_ready():
+        state = warmup_status()
+        if state["status"] == "failed":
+            return HttpResponse(f"warm-up failed: {state.get('error')}", status=503, content_type="text/plain")
+        return HttpResponse("warming", status=503, content_type="text/plain")
     return HttpResponse("ok", content_type="text/plain")
 
 
@@ -1,6 +1,15 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
+# Run a background worker and restart it whenever it exits.
+supervise() {
+  while true; do
+    "$@" && status=0 || status=$?
+    echo "$* exited with status ${status}; restarting in 5s" >&2
+    sleep 5
+  done
+}
+
 python manage.py migrate --noinput
 
 if [[ -n "${ADMIN_EMAIL:-}" && -n "${ADMIN_PASSWORD:-}" ]]; then
@@ -11,9 +20,35 @@ if [[ -n "${ADMIN_EMAIL:-}" && -n "${ADMIN_PASSWORD:-}" ]]; then
     --force
 fi
 
-exec gunicorn myproject.wsgi:application \
-  --bind "0.0.0.0:${PORT:-10000}" \
-  --workers "${WEB_CONCURRENCY:-1}" \
-  --timeout "${GUNICORN_TIMEOUT:-120}" \
-  --access-logfile - \
-  --error-logfile -
+# Fetch model weights with an in-process engine before anything serves; the
+# sidecar or each worker then only has to load them from disk.
+if [[ "${KYC_WARMUP:-background}" != "off" ]]; then
+  python manage.py warmup_models || echo "Model warm-up failed; workers will retry on boot" >&2
+fi
+
+# The sidecar listens only once its models are built, so wait for it before
+# the web workers start pinging it.
+if [[ "${KYC_INFERENCE_BACKEND:-local}" == "sidecar" ]]; then
+  supervise python manage.py run_inference_server &
+  python manage.py wait_for_inference_server || echo "Inference sidecar is not answering yet; workers will keep retrying" >&2
+fi
+
+if [[ "${OCR_WORKER_PROCESSES:-0}" -gt 0 ]]; then
+  supervise python manage.py run_ocr_worker --processes "${OCR_WORKER_PROCESSES}" &
+fi
+
+# Async verification jobs run in their own process so a recycled web worker
+# does not take them down; the worker also re-queues jobs orphaned mid-run.
+# It loads its own face models unless KYC_INFERENCE_BACKEND=sidecar, so it only
+# starts by default when async verification is on.
+case "${KYC_VERIFY_ASYNC:-false}" in
+  1|true|TRUE|True|yes|on) default_verify_workers=1 ;;
+  *) default_verify_workers=0 ;;
+esac
+verify_workers="${VERIFY_WORKER_PROCESSES:-${default_verify_workers}}"
+if [[ "${verify_workers}" -gt 0 ]]; then
+  export KYC_VERIFY_EMBEDDED_WORKER=false
+  supervise python manage.py run_verification_jobs --loop --processes "${verify_workers}" &
+fi
+
+exec gunicorn myproject.wsgi:application --config myproject/gunicorn_conf.py
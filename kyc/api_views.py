@@ -1,11 +1,12 @@
 import base64
+import io
 import json
 import os
 from datetime import datetime, timezone
 
-import cv2
-import numpy as np
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -14,6 +15,12 @@ from django.utils import timezone as dj_timezone
 from django.utils.dateparse import parse_date
 
 from .models import VerificationSession, Tenant, Customer
+from .services import counters
+from .services.card_physical_check import capture_frame_metrics
+from .services.capture_upload import CaptureTooLarge, MediaTempFileUploadHandler, discard, stream_to_temp
+from .services.capture_preview import decode_preview
+from .services.image_header import read_image_header, read_image_size
+from .services.quality_gate import capture_quality
 
 
 CARD_TYPE_LABELS = {
@@ -65,6 +72,7 @@ def start_session(request):
         created_at=now,
         updated_at=now,
     )
+    counters.record_session_created(tenant)
 
     return JsonResponse({"success": True, "session_id": str(session_uuid), "status": "started"})
 
@@ -207,7 +215,22 @@ def session_status(request, session_id):
         "ip_address": session.ip_address,
     }
 
-    return JsonResponse({"success": True, "session": data})
+    response = {"success": True, "session": data}
+    job = session.verification_jobs.order_by("-created_at", "-id").first()
+    if job is not None:
+        response["verification_job"] = {
+            "id": job.id,
+            "status": job.status,
+            "stage": job.stage,
+            "progress": job.progress,
+            "created_at": job.created_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "result": job.result,
+            "error": job.error,
+        }
+
+    return JsonResponse(response)
 
 
 @csrf_exempt
@@ -303,17 +326,25 @@ def capture_image(request):
     except VerificationSession.DoesNotExist:
         return JsonResponse({"success": False, "error": "Session not found"}, status=404)
 
-    # Verify image quality
-    img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
-    if img is None:
+    # Validate dimensions from the header; the pixels are not needed here.
+    try:
+        _, width, height = read_image_header(io.BytesIO(image_bytes))
+    except ValueError:
         return JsonResponse({"success": False, "error": "Invalid image data"}, status=400)
 
-    height, width = img.shape[:2]
-    if width < 200 or height < 200:
-        return JsonResponse({
-            "success": False,
-            "error": f"Image too small ({width}x{height}). Please retake with better quality.",
-        }, status=400)
+    size_error = _capture_size_error(width, height)
+    if size_error:
+        return JsonResponse({"success": False, "error": size_error}, status=400)
+
+    if not _is_capture_type(image_type):
+        return JsonResponse({"success": False, "error": "Invalid image type"}, status=400)
+
+    preview = decode_preview(image_bytes=image_bytes)
+    if preview is None:
+        return JsonResponse({"success": False, "error": "Invalid image data"}, status=400)
+    quality = capture_quality(preview, image_type)
+    if quality["enforced"] and not quality["passed"]:
+        return JsonResponse({"success": False, "error": quality["message"], "quality": quality}, status=400)
 
     os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -323,54 +354,187 @@ def capture_image(request):
     with open(filepath, "wb") as f:
         f.write(image_bytes)
 
-    col_map = {
-        "front": "front_image",
-        "back": "back_image",
-        "selfie": "selfie_image",
-    }
-    doc_col_map = {
-        "front": "document_front_url",
-        "back": "document_back_url",
-        "selfie": "selfie_url",
-    }
-    step_map = {"front": 2, "back": 3, "selfie": 4}
+    if not _apply_capture(session, image_type, filename, preview=preview, path=filepath):
+        return JsonResponse({"success": False, "error": "Invalid image type"}, status=400)
+
+    return JsonResponse({
+        "success": True,
+        "filename": filename,
+        "path": filepath,
+        "size": len(image_bytes),
+        "quality": quality,
+    })
 
-    col = col_map.get(image_type)
+
+_CAPTURE_COLUMNS = {
+    "front": "front_image",
+    "back": "back_image",
+    "selfie": "selfie_image",
+}
+_CAPTURE_DOC_COLUMNS = {
+    "front": "document_front_url",
+    "back": "document_back_url",
+    "selfie": "selfie_url",
+}
+_CAPTURE_STEPS = {"front": 2, "back": 3, "selfie": 4}
+_CAPTURE_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+_MIN_CAPTURE_EDGE = 200
+_MAX_CAPTURE_PIXELS = 50_000_000
+
+
+def _is_capture_type(image_type):
+    return image_type in _CAPTURE_COLUMNS or image_type.startswith("tilt_")
+
+
+def _apply_capture(session, image_type, filename, preview=None, path=None):
+    """
+    Point the session at a stored capture; returns False for an unknown type.
+    Tilt frames also get their physicality metrics computed now (at the
+    configured pyramid level), so the final check only aggregates stored
+    numbers.
+    """
+    col = _CAPTURE_COLUMNS.get(image_type)
     is_tilt_frame = image_type.startswith("tilt_")
 
     if not col and not is_tilt_frame:
-        return JsonResponse({"success": False, "error": "Invalid image type"}, status=400)
-
-    new_step = step_map.get(image_type, 1)
-    update_fields = ["updated_at"]
+        return False
 
     if is_tilt_frame:
-        frames = list(session.tilt_frames or [])
-        frames.append(filename)
-        session.tilt_frames = frames[-5:]
-        session.thickness_card = filename
-        session.current_step = max(session.current_step, 5)
-        update_fields.extend(["tilt_frames", "thickness_card", "current_step"])
-    else:
-        setattr(session, col, filename)
-        doc_col = doc_col_map.get(image_type)
-        if doc_col:
-            setattr(session, doc_col, filename)
-        if session.current_step < new_step:
-            session.current_step = new_step
-        update_fields.extend([col, "current_step"])
-        if doc_col:
-            update_fields.append(doc_col)
+        metrics = capture_frame_metrics(path, preview=preview) if path else None
+        # Tilt frames arrive in parallel; lock the row so concurrent uploads
+        # do not drop each other's frames or metrics.
+        with transaction.atomic():
+            locked = (
+                VerificationSession.objects.select_for_update()
+                .only("tilt_frames", "tilt_frame_metrics", "current_step")
+                .get(pk=session.pk)
+            )
+            frames = list(locked.tilt_frames or [])
+            frames.append(filename)
+            session.tilt_frames = frames[-5:]
+            session.thickness_card = filename
+            session.current_step = max(locked.current_step, 5)
+            stored = dict(locked.tilt_frame_metrics or {})
+            if metrics is not None:
+                stored[filename] = metrics
+            session.tilt_frame_metrics = {name: stored[name] for name in session.tilt_frames if name in stored}
+            session.updated_at = datetime.now(timezone.utc)
+            session.save(
+                update_fields=["tilt_frames", "thickness_card", "current_step", "tilt_frame_metrics", "updated_at"]
+            )
+        return True
+
+    update_fields = ["updated_at", col, "current_step"]
+    setattr(session, col, filename)
+    doc_col = _CAPTURE_DOC_COLUMNS.get(image_type)
+    if doc_col:
+        setattr(session, doc_col, filename)
+        update_fields.append(doc_col)
+    session.current_step = max(session.current_step, _CAPTURE_STEPS.get(image_type, 1))
 
     session.updated_at = datetime.now(timezone.utc)
     session.save(update_fields=update_fields)
+    return True
 
-    return JsonResponse({
-        "success": True,
-        "filename": filename,
-        "path": filepath,
-        "size": len(image_bytes),
-    })
+
+def _capture_size_error(width, height):
+    if width < _MIN_CAPTURE_EDGE or height < _MIN_CAPTURE_EDGE:
+        return f"Image too small ({width}x{height}). Please retake with better quality."
+    if width * height > _MAX_CAPTURE_PIXELS:
+        return f"Image too large ({width}x{height})."
+    return None
+
+
+@csrf_exempt
+def capture_upload(request):
+    """
+    Binary capture upload.
+
+    Accepts either multipart/form-data (file field `image`, plus `type`,
+    `session_id` and tenant fields) or a raw `image/*` body with those values in
+    the query string. The file is streamed to disk in small chunks, validated
+    from its header and moved into MEDIA_ROOT atomically.
+    """
+    if request.method == "OPTIONS":
+        response = JsonResponse({"success": True})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Headers"] = "Content-Type, X-Tenant-Id, X-Tenant-Slug"
+        response["Access-Control-Allow-Methods"] = "POST"
+        return response
+
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "Only POST requests allowed"}, status=405)
+
+    temp_path = None
+    handler = None
+    try:
+        if request.content_type == "multipart/form-data":
+            handler = MediaTempFileUploadHandler(request)
+            request.upload_handlers = [handler]
+            data = request.POST
+            upload = request.FILES.get("image")
+            if handler.too_large:
+                return JsonResponse({"success": False, "error": "Image upload too large"}, status=413)
+            temp_path = getattr(upload, "temp_path", None)
+            size = upload.size if upload is not None else 0
+        else:
+            data = request.GET
+            try:
+                temp_path, size = stream_to_temp(request)
+            except CaptureTooLarge:
+                return JsonResponse({"success": False, "error": "Image upload too large"}, status=413)
+
+        image_type = data.get("type") or ""
+        session_id = data.get("session_id")
+        if not temp_path or not size or not image_type or not session_id:
+            return JsonResponse({"success": False, "error": "Missing image, type, or session_id"}, status=400)
+        if not _is_capture_type(image_type):
+            return JsonResponse({"success": False, "error": "Invalid image type"}, status=400)
+
+        tenant = _resolve_tenant(data, request)
+        if tenant is None:
+            return JsonResponse({"success": False, "error": "Missing or invalid tenant"}, status=400)
+
+        try:
+            session = VerificationSession.objects.get(id=session_id, tenant=tenant)
+        except (VerificationSession.DoesNotExist, ValidationError):
+            return JsonResponse({"success": False, "error": "Session not found"}, status=404)
+
+        try:
+            image_format, width, height = read_image_size(temp_path)
+        except (OSError, ValueError):
+            return JsonResponse({"success": False, "error": "Invalid image data"}, status=400)
+        size_error = _capture_size_error(width, height)
+        if size_error:
+            return JsonResponse({"success": False, "error": size_error}, status=400)
+
+        preview = decode_preview(path=temp_path)
+        if preview is None:
+            return JsonResponse({"success": False, "error": "Invalid image data"}, status=400)
+        quality = capture_quality(preview, image_type)
+        if quality["enforced"] and not quality["passed"]:
+            return JsonResponse({"success": False, "error": quality["message"], "quality": quality}, status=400)
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        filename = f"{image_type}_{timestamp}.{_CAPTURE_EXTENSIONS[image_format]}"
+        filepath = os.path.join(settings.MEDIA_ROOT, filename)
+        os.replace(temp_path, filepath)
+        temp_path = None
+
+        _apply_capture(session, image_type, filename, preview=preview, path=filepath)
+        return JsonResponse({
+            "success": True,
+            "filename": filename,
+            "path": filepath,
+            "size": size,
+            "width": width,
+            "height": height,
+            "quality": quality,
+        })
+    finally:
+        discard(temp_path)
+        if handler is not None:
+            handler.cleanup()
 
 
 def _parse_json(request):
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class KycConfig(AppConfig):
     name = 'kyc'
+
+    def ready(self):
+        from .services.compute import apply_compute_limits
+
+        apply_compute_limits()
@@ -0,0 +1,158 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from kyc.services.compute import compute_limits
+
+WORKLOADS = ("opencv", "blas", "face")
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    return float(np.percentile(np.asarray(values), percent))
+
+
+def _opencv_workload():
+    import cv2
+
+    from kyc.services.quality_gate import assess_frame
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(1080, 1920, 3), dtype=np.uint8)
+
+    def step():
+        resized = cv2.resize(frame, (1600, 900), interpolation=cv2.INTER_AREA)
+        cv2.GaussianBlur(resized, (5, 5), 0)
+        assess_frame(frame)
+
+    return step
+
+
+def _blas_workload():
+    rng = np.random.default_rng(0)
+    left = rng.random((512, 512), dtype=np.float32)
+    right = rng.random((512, 512), dtype=np.float32)
+    return lambda: left @ right
+
+
+def _face_workload():
+    from kyc.services.face_engine import get_face_engine
+
+    engine = get_face_engine()
+    batches = []
+    for model_name in getattr(settings, "FACE_VERIFY_MODELS", ["VGG-Face", "Facenet"]):
+        height, width = engine.load_model(model_name).input_shape
+        batches.append((np.zeros((2, height, width, 3), dtype=np.float32), model_name))
+
+    def step():
+        for batch, model_name in batches:
+            engine.forward(batch, model_name)
+
+    return step
+
+
+_BUILDERS = {"opencv": _opencv_workload, "blas": _blas_workload, "face": _face_workload}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput of the OpenCV, BLAS and face-model workloads under different "
+        "KYC_COMPUTE_THREADS values, with several processes running at once like gunicorn workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", default="1,2,4", help="Comma-separated thread counts to compare.")
+        parser.add_argument("--processes", type=int, default=None, help="Concurrent processes (default WEB_CONCURRENCY).")
+        parser.add_argument("--seconds", type=float, default=3.0, help="Run time per workload and setting.")
+        parser.add_argument("--workloads", default="opencv,blas", help=f"Comma-separated subset of {', '.join(WORKLOADS)}.")
+        parser.add_argument("--child", action="store_true", help="Internal: run the workloads once and print JSON.")
+
+    def handle(self, *args, **options):
+        workloads = [name.strip() for name in options["workloads"].split(",") if name.strip()]
+        unknown = sorted(set(workloads) - set(WORKLOADS))
+        if unknown:
+            raise CommandError(f"Unknown workload(s): {', '.join(unknown)}")
+
+        if options["child"]:
+            self.stdout.write(json.dumps(self._run_workloads(workloads, options["seconds"])))
+            return
+
+        try:
+            thread_counts = [int(value) for value in options["threads"].split(",") if value.strip()]
+        except ValueError:
+            raise CommandError("--threads must be a comma-separated list of integers")
+        processes = max(1, options["processes"] or int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+
+        self.stdout.write(f"{'threads':>7}  {'workload':<8}  {'procs':>5}  {'ops/s':>9}  {'p95 ms':>8}")
+        for threads in thread_counts:
+            reports = self._run_children(threads, processes, workloads, options["seconds"])
+            for name in workloads:
+                results = [report[name] for report in reports if name in report]
+                errors = [result["error"] for result in results if "error" in result]
+                if errors:
+                    self.stdout.write(f"{threads:>7}  {name:<8}  {processes:>5}  skipped: {errors[0]}")
+                    continue
+                throughput = sum(result["ops"] / result["elapsed"] for result in results if result["elapsed"])
+                p95 = max(result["p95_ms"] for result in results)
+                self.stdout.write(f"{threads:>7}  {name:<8}  {processes:>5}  {throughput:>9.1f}  {p95:>8.2f}")
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
+
+    def _run_children(self, threads, processes, workloads, seconds):
+        env = dict(os.environ)
+        env.update(
+            KYC_COMPUTE_THREADS=str(threads),
+            KYC_TF_INTRA_OP_THREADS=str(threads),
+            KYC_OPENCV_THREADS=str(threads),
+            KYC_BLAS_THREADS=str(threads),
+        )
+        child_args = [
+            sys.executable,
+            sys.argv[0],
+            "benchmark_compute",
+            "--child",
+            "--workloads",
+            ",".join(workloads),
+            "--seconds",
+            str(seconds),
+        ]
+        children = [
+            subprocess.Popen(child_args, env=env, stdout=subprocess.PIPE, text=True) for _ in range(processes)
+        ]
+        reports = []
+        for child in children:
+            output, _ = child.communicate()
+            if child.returncode:
+                raise CommandError(f"Benchmark process exited with {child.returncode}")
+            reports.append(json.loads(output.strip().splitlines()[-1]))
+        return reports
+
+    def _run_workloads(self, workloads, seconds):
+        report = {"limits": compute_limits()}
+        for name in workloads:
+            try:
+                step = _BUILDERS[name]()
+                step()
+            except Exception as exc:
+                report[name] = {"error": f"{type(exc).__name__}: {exc}"[:200]}
+                continue
+
+            latencies = []
+            started = time.perf_counter()
+            while time.perf_counter() - started < seconds or not latencies:
+                step_started = time.perf_counter()
+                step()
+                latencies.append((time.perf_counter() - step_started) * 1000.0)
+            report[name] = {
+                "ops": len(latencies),
+                "elapsed": time.perf_counter() - started,
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+            }
+        return report
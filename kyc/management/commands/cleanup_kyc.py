@@ -2,14 +2,23 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from kyc.models import VerificationLink
+from kyc.services import ocr_cache
+from kyc.services.embedding_cache import get_embedding_cache
 
 
 class Command(BaseCommand):
-    help = "Delete expired verification links."
+    help = "Delete expired verification links, OCR cache entries and on-disk face embeddings."
 
     def handle(self, *args, **options):
         now = timezone.now()
         qs = VerificationLink.objects.filter(expires_at__isnull=False, expires_at__lt=now)
         count = qs.count()
         qs.delete()
-        self.stdout.write(self.style.SUCCESS(f"Deleted {count} expired link(s)"))
+        purged = ocr_cache.purge_expired()
+        embeddings = get_embedding_cache().purge_expired()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {count} expired link(s), {purged} expired OCR cache row(s) "
+                f"and {embeddings} expired embedding file(s)"
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from kyc.services import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters from the source tables. Schedule it (e.g. hourly) to correct drift."
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile()
+        for key, correction in sorted(drift.items()):
+            self.stdout.write(f"{key}: {correction:+d}")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled dashboard counters ({len(drift)} corrected)"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from kyc.services.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Aggregate sessions updated since the last run into per-tenant daily rollups. Schedule it (e.g. every 15 minutes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Ignore the watermark and rebuild every day, dropping rollups whose sessions are gone.")
+
+    def handle(self, *args, **options):
+        result = refresh_rollups(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed {result['buckets']} tenant-day rollup(s) across {result['days']} day(s); "
+                f"watermark {result['watermark'].isoformat()}"
+            )
+        )
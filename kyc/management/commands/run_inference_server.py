@@ -0,0 +1,42 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kyc.services.inference_sidecar import InferenceServer, build_sidecar_engine, sidecar_address
+from kyc.services.warmup import run_warmup
+
+
+class Command(BaseCommand):
+    help = "Run the local face inference sidecar used when KYC_INFERENCE_BACKEND=sidecar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--socket", default=None, help="Unix socket path (default KYC_INFERENCE_SOCKET).")
+        parser.add_argument("--max-batch", type=int, default=None, help="Faces per forward batch.")
+        parser.add_argument("--batch-window-ms", type=float, default=None, help="How long to wait for more requests.")
+        parser.add_argument("--queue-size", type=int, default=None, help="Requests admitted at once before replying busy.")
+        parser.add_argument("--skip-warmup", action="store_true", help="Start serving before the models are built.")
+
+    def handle(self, *args, **options):
+        engine = build_sidecar_engine(max_batch=options["max_batch"], window_ms=options["batch_window_ms"])
+        if not options["skip_warmup"]:
+            state = run_warmup(engine=engine)
+            if state["status"] == "failed":
+                self.stderr.write(f"Model warm-up failed: {state.get('error')}")
+            else:
+                self.stdout.write(f"Models warmed up in {state.get('elapsed_seconds')}s")
+
+        queue_size = options["queue_size"] or int(getattr(settings, "KYC_INFERENCE_QUEUE_SIZE", 16))
+        server = InferenceServer(engine, address=options["socket"] or sidecar_address(), queue_size=queue_size)
+
+        def _terminate(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, _terminate)
+
+        self.stdout.write(f"Inference sidecar listening on {server.address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Inference sidecar stopped"))
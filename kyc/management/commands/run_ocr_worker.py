@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+from kyc.services.mistral_ai import run_ocr_worker
+
+
+class Command(BaseCommand):
+    help = "Process the durable OCR job queue. Run several copies (or --processes N) to scale out."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run.")
+        parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between idle polls.")
+        parser.add_argument("--once", action="store_true", help="Drain visible jobs and exit.")
+
+    def handle(self, *args, **options):
+        processes = max(1, options["processes"])
+        if processes > 1:
+            self._run_children(processes, options)
+            return
+
+        processed = run_ocr_worker(poll_interval=options["poll_interval"], once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} OCR job(s)"))
+
+    def _run_children(self, processes, options):
+        child_args = [sys.executable, sys.argv[0], "run_ocr_worker", "--processes", "1"]
+        if options["poll_interval"] is not None:
+            child_args.extend(["--poll-interval", str(options["poll_interval"])])
+        if options["once"]:
+            child_args.append("--once")
+
+        children = [subprocess.Popen(child_args) for _ in range(processes)]
+        self.stdout.write(f"Started {processes} OCR worker process(es)")
+        try:
+            exit_codes = [child.wait() for child in children]
+        except KeyboardInterrupt:
+            for child in children:
+                child.terminate()
+            exit_codes = [child.wait() for child in children]
+        if any(exit_codes):
+            self.stderr.write(f"OCR worker exit codes: {exit_codes}")
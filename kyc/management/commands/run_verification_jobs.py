@@ -0,0 +1,122 @@
+import signal
+import subprocess
+import sys
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from kyc.models import VerificationJob
+from kyc.views import _run_verification_job
+
+
+def requeue_stale_jobs(stale_minutes):
+    """Put jobs whose worker died mid-run back in the queue."""
+    if stale_minutes <= 0:
+        return 0
+    cutoff = timezone.now() - timedelta(minutes=stale_minutes)
+    return VerificationJob.objects.filter(status="running", started_at__lt=cutoff).update(
+        status="queued", stage=None, progress=0, started_at=None
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued async verification jobs. With --loop it keeps polling and re-queues jobs "
+        "left behind by a restarted web worker, so it can run as the dedicated verification worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requeue-stale-minutes",
+            type=int,
+            default=None,
+            help="Re-queue jobs stuck in 'running' for longer than this many minutes "
+            "(default KYC_VERIFY_STALE_MINUTES; 0 disables).",
+        )
+        parser.add_argument("--limit", type=int, default=50, help="Maximum jobs to run per pass.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for jobs until stopped.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between idle polls with --loop.")
+        parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run.")
+
+    def handle(self, *args, **options):
+        stale_minutes = options["requeue_stale_minutes"]
+        if stale_minutes is None:
+            stale_minutes = int(getattr(settings, "KYC_VERIFY_STALE_MINUTES", 15))
+        stale_minutes = max(0, stale_minutes)
+
+        processes = max(1, options["processes"])
+        if processes > 1:
+            self._run_children(processes, options, stale_minutes)
+            return
+
+        if not options["loop"]:
+            ran, requeued = self._run_pass(stale_minutes, options["limit"])
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} job(s), re-queued {requeued} stale job(s)"))
+            return
+
+        signal.signal(signal.SIGTERM, self._stop)
+        total = 0
+        poll_interval = max(0.1, options["poll_interval"])
+        try:
+            while True:
+                try:
+                    ran, _ = self._run_pass(stale_minutes, options["limit"])
+                except Exception:
+                    # Keep the worker alive through transient database errors.
+                    self.stderr.write("Verification worker pass failed; retrying")
+                    ran = 0
+                finally:
+                    close_old_connections()
+                total += ran
+                if not ran:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} job(s)"))
+
+    def _stop(self, signum, frame):
+        raise KeyboardInterrupt
+
+    def _run_pass(self, stale_minutes, limit):
+        requeued = requeue_stale_jobs(stale_minutes)
+        job_ids = list(
+            VerificationJob.objects.filter(status="queued").order_by("created_at", "id").values_list("id", flat=True)[
+                :limit
+            ]
+        )
+        for job_id in job_ids:
+            _run_verification_job(job_id)
+        return len(job_ids), requeued
+
+    def _run_children(self, processes, options, stale_minutes):
+        child_args = [
+            sys.executable,
+            sys.argv[0],
+            "run_verification_jobs",
+            "--processes",
+            "1",
+            "--requeue-stale-minutes",
+            str(stale_minutes),
+            "--limit",
+            str(options["limit"]),
+            "--poll-interval",
+            str(options["poll_interval"]),
+        ]
+        if options["loop"]:
+            child_args.append("--loop")
+
+        signal.signal(signal.SIGTERM, self._stop)
+        children = [subprocess.Popen(child_args) for _ in range(processes)]
+        self.stdout.write(f"Started {processes} verification worker process(es)")
+        try:
+            exit_codes = [child.wait() for child in children]
+        except KeyboardInterrupt:
+            for child in children:
+                child.terminate()
+            exit_codes = [child.wait() for child in children]
+        if any(exit_codes):
+            self.stderr.write(f"Verification worker exit codes: {exit_codes}")
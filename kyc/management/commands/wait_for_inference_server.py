@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kyc.services.inference_sidecar import get_remote_engine
+from kyc.services.warmup import wait_for_sidecar
+
+
+class Command(BaseCommand):
+    help = "Block until the inference sidecar answers a ping, retrying with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=None,
+            help="Give up after this many seconds (default KYC_INFERENCE_READY_TIMEOUT).",
+        )
+
+    def handle(self, *args, **options):
+        engine = get_remote_engine()
+        try:
+            info = wait_for_sidecar(engine, timeout=options["timeout"])
+        except Exception as exc:
+            raise CommandError(f"Inference sidecar at {engine.address} is not answering: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Inference sidecar is ready ({info})"))
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from kyc.services.embedding_cache import get_embedding_cache
+from kyc.services.face_engine import FaceEmbeddingEngine
+from kyc.services.warmup import run_warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Import TensorFlow, build the configured face models and run one dummy inference (downloads weights on "
+        "first run). Always uses an in-process engine, also with KYC_INFERENCE_BACKEND=sidecar."
+    )
+
+    def handle(self, *args, **options):
+        engine = FaceEmbeddingEngine(
+            detector_backend=getattr(settings, "FACE_DETECTOR_BACKEND", "opencv"),
+            cache=get_embedding_cache(),
+        )
+        state = run_warmup(engine=engine)
+        if state["status"] != "ready":
+            raise CommandError(f"Warm-up failed: {state.get('error')}")
+        timings = ", ".join(f"{name} {seconds}s" for name, seconds in state["models"].items())
+        self.stdout.write(self.style.SUCCESS(f"Warm-up finished in {state['elapsed_seconds']}s ({timings})"))
@@ -0,0 +1,72 @@
+"""
+Index operations for migrations on large tables.
+
+`AddIndexOnline` runs `CREATE INDEX CONCURRENTLY` on PostgreSQL, so
+`kyc_sessions` keeps taking writes while the index builds. Elsewhere it
+behaves like `AddIndex`. A migration using it must set `atomic = False`,
+because PostgreSQL refuses concurrent index builds inside a transaction.
+
+`AddPartialIndex` only touches the database, and only on backends that
+support partial indexes. The index is kept out of the model state, so MySQL
+deployments do not get the `models.W037` system check warning. Models that
+rely on such an index must also work without it.
+"""
+from django.db import migrations
+from django.db.migrations.operations.base import Operation
+
+
+def _concurrently(schema_editor) -> dict:
+    return {"concurrently": True} if schema_editor.connection.vendor == "postgresql" else {}
+
+
+class AddIndexOnline(migrations.AddIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **_concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **_concurrently(schema_editor))
+
+
+class AddPartialIndex(Operation):
+    reversible = True
+
+    def __init__(self, model_name, index):
+        self.model_name = model_name
+        self.index = index
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _supported(self, schema_editor, model) -> bool:
+        return bool(
+            self.allow_migrate_model(schema_editor.connection.alias, model)
+            and schema_editor.connection.features.supports_partial_indexes
+        )
+
+    def _create(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if self._supported(schema_editor, model):
+            schema_editor.add_index(model, self.index, **_concurrently(schema_editor))
+
+    def _drop(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if self._supported(schema_editor, model):
+            schema_editor.remove_index(model, self.index, **_concurrently(schema_editor))
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._create(app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._drop(app_label, schema_editor, to_state)
+
+    def describe(self):
+        return f"Create partial index {self.index.name} on {self.model_name} where supported"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_{self.index.name.lower()}"
+
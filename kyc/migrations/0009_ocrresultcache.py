@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0008_ocrjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ocr_cache_entries', to='kyc.tenant')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ocr_cache_entries', to='kyc.verificationsession')),
+                ('image_sha256', models.CharField(max_length=64)),
+                ('model', models.CharField(max_length=100)),
+                ('document_type', models.CharField(blank=True, default='', max_length=50)),
+                ('side', models.CharField(blank=True, default='', max_length=20)),
+                ('preprocess', models.CharField(blank=True, default='', max_length=64)),
+                ('result', models.JSONField()),
+                ('hits', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'kyc_ocr_result_cache',
+                'indexes': [models.Index(fields=['expires_at'], name='kyc_ocr_result_cache_exp_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'image_sha256', 'model', 'document_type', 'side', 'preprocess'), name='kyc_ocr_result_cache_key_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0009_ocrresultcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationsession',
+            name='tilt_frame_metrics',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:56
+
+from django.db import migrations, models
+
+from kyc.migration_operations import AddIndexOnline, AddPartialIndex
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('kyc', '0010_verificationsession_tilt_frame_metrics'),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name='verificationsession',
+            index=models.Index(fields=['tenant', '-created_at', '-id'], name='kyc_sess_tenant_created_idx'),
+        ),
+        AddIndexOnline(
+            model_name='verificationsession',
+            index=models.Index(fields=['tenant', 'review_status', '-created_at', '-id'], name='kyc_sess_tenant_review_idx'),
+        ),
+        AddIndexOnline(
+            model_name='verificationsession',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='kyc_sess_status_created_idx'),
+        ),
+        AddIndexOnline(
+            model_name='verificationsession',
+            index=models.Index(fields=['review_status', '-created_at', '-id'], name='kyc_sess_review_created_idx'),
+        ),
+        AddPartialIndex(
+            model_name='verificationsession',
+            index=models.Index(condition=models.Q(('review_status', 'pending')), fields=['-created_at', '-id'], name='kyc_sess_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0013_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'kyc_rollup_watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='TenantDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sessions', models.IntegerField(default=0)),
+                ('checked', models.IntegerField(default=0)),
+                ('verified', models.IntegerField(default=0)),
+                ('liveness_passed', models.IntegerField(default=0)),
+                ('physical_passed', models.IntegerField(default=0)),
+                ('approved', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('similarity_sum', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'kyc_tenant_daily_rollups',
+            },
+        ),
+        migrations.AddField(
+            model_name='tenantdailyrollup',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='kyc.tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='tenantdailyrollup',
+            index=models.Index(fields=['day'], name='kyc_rollup_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tenantdailyrollup',
+            constraint=models.UniqueConstraint(fields=('tenant', 'day'), name='kyc_tenant_daily_rollup_uniq'),
+        ),
+    ]
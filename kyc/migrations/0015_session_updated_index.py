@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:02
+
+from django.db import migrations, models
+
+from kyc.migration_operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('kyc', '0014_tenant_daily_rollups'),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name='verificationsession',
+            index=models.Index(fields=['updated_at'], name='kyc_sess_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+def clear_unchecked_similarity(apps, schema_editor):
+    # Before this migration a session that never reached face verification
+    # kept the default 0, so those rows are the best guess for "not checked".
+    VerificationSession = apps.get_model('kyc', 'VerificationSession')
+    VerificationSession.objects.filter(verify_similarity=0).update(verify_similarity=None)
+
+
+def restore_zero_similarity(apps, schema_editor):
+    VerificationSession = apps.get_model('kyc', 'VerificationSession')
+    VerificationSession.objects.filter(verify_similarity__isnull=True).update(verify_similarity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0015_session_updated_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='verificationsession',
+            name='verify_similarity',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(clear_unchecked_similarity, restore_zero_similarity),
+    ]
@@ -93,6 +93,7 @@ class VerificationSession(models.Model):
     selfie_url = models.CharField(max_length=255, blank=True, null=True)
     thickness_card = models.CharField(max_length=255, blank=True, null=True)
     tilt_frames = models.JSONField(blank=True, null=True)
+    tilt_frame_metrics = models.JSONField(blank=True, null=True)
     detected_card_type = models.CharField(max_length=80, blank=True, null=True)
 
     liveness_running = models.BooleanField(default=False)
@@ -105,7 +106,7 @@ class VerificationSession(models.Model):
 
     verify_verified = models.BooleanField(default=False)
     verify_confidence = models.FloatField(default=0)
-    verify_similarity = models.FloatField(default=0)
+    verify_similarity = models.FloatField(blank=True, null=True)
     physical_card_verified = models.BooleanField(default=False)
     physical_card_score = models.FloatField(default=0)
     edge_consistency_score = models.FloatField(default=0)
@@ -131,6 +132,160 @@ class VerificationSession(models.Model):
 
     class Meta:
         db_table = "kyc_sessions"
+        indexes = [
+            models.Index(fields=["tenant", "-created_at", "-id"], name="kyc_sess_tenant_created_idx"),
+            models.Index(fields=["tenant", "review_status", "-created_at", "-id"], name="kyc_sess_tenant_review_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], name="kyc_sess_status_created_idx"),
+            models.Index(fields=["review_status", "-created_at", "-id"], name="kyc_sess_review_created_idx"),
+            models.Index(fields=["updated_at"], name="kyc_sess_updated_idx"),
+        ]
+        # kyc_sess_pending_idx (-created_at, -id WHERE review_status = 'pending') is
+        # created by migrations only where partial indexes exist; MySQL uses
+        # kyc_sess_review_created_idx instead.
+
+
+class VerificationJob(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    session = models.ForeignKey("VerificationSession", on_delete=models.CASCADE, related_name="verification_jobs")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    stage = models.CharField(max_length=50, blank=True, null=True)
+    progress = models.IntegerField(default=0)
+    payload = models.JSONField()
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"VerificationJob {self.id} ({self.status})"
+
+    class Meta:
+        db_table = "kyc_verification_jobs"
+
+
+class OcrJob(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    session = models.ForeignKey("VerificationSession", on_delete=models.CASCADE, related_name="ocr_jobs")
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.IntegerField(default=0)
+    run_after = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"OcrJob {self.id} ({self.status})"
+
+    class Meta:
+        db_table = "kyc_ocr_jobs"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="kyc_ocr_jobs_status_run_idx"),
+        ]
+
+
+class OcrResultCache(models.Model):
+    # Entries hold extracted PII, so they are scoped to one tenant and removed
+    # with the session that produced them. Lookups always filter on tenant.
+    tenant = models.ForeignKey("Tenant", on_delete=models.CASCADE, null=True, blank=True, related_name="ocr_cache_entries")
+    session = models.ForeignKey(
+        "VerificationSession", on_delete=models.CASCADE, null=True, blank=True, related_name="ocr_cache_entries"
+    )
+    image_sha256 = models.CharField(max_length=64)
+    model = models.CharField(max_length=100)
+    document_type = models.CharField(max_length=50, blank=True, default="")
+    side = models.CharField(max_length=20, blank=True, default="")
+    preprocess = models.CharField(max_length=64, blank=True, default="")
+    result = models.JSONField()
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"OcrResultCache {self.image_sha256[:12]} {self.side}"
+
+    class Meta:
+        db_table = "kyc_ocr_result_cache"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "image_sha256", "model", "document_type", "side", "preprocess"],
+                name="kyc_ocr_result_cache_key_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"], name="kyc_ocr_result_cache_exp_idx"),
+        ]
+
+
+class DashboardCounter(models.Model):
+    scope = models.CharField(max_length=64)  # "platform" or "tenant:<id>"
+    name = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.scope}/{self.name}={self.value}"
+
+    class Meta:
+        db_table = "kyc_dashboard_counters"
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "name"], name="kyc_dashboard_counter_key_uniq"),
+        ]
+
+
+class TenantDailyRollup(models.Model):
+    tenant = models.ForeignKey("Tenant", on_delete=models.CASCADE, related_name="daily_rollups")
+    day = models.DateField()
+    sessions = models.IntegerField(default=0)
+    # Sessions that reached face verification (non-zero similarity); the pass rates use it as denominator.
+    checked = models.IntegerField(default=0)
+    verified = models.IntegerField(default=0)
+    liveness_passed = models.IntegerField(default=0)
+    physical_passed = models.IntegerField(default=0)
+    approved = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    similarity_sum = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"TenantDailyRollup {self.tenant_id} {self.day}"
+
+    class Meta:
+        db_table = "kyc_tenant_daily_rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["tenant", "day"], name="kyc_tenant_daily_rollup_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["day"], name="kyc_rollup_day_idx"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} @ {self.value.isoformat()}"
+
+    class Meta:
+        db_table = "kyc_rollup_watermarks"
 
 
 class VerificationLink(models.Model):
@@ -0,0 +1,18 @@
+"""
+Reduced-resolution decoding of captured images.
+
+Capture endpoints decode each upload once at 1/2 scale (JPEG decoders do this
+in the DCT, far cheaper than a full decode) and run the quality gate and the
+per-frame tilt metrics on that preview instead of the full-resolution pixels.
+"""
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def decode_preview(image_bytes: bytes = None, path: str = None) -> Optional[np.ndarray]:
+    """Decode a capture at reduced resolution from bytes or a file path."""
+    if image_bytes is not None:
+        return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_REDUCED_COLOR_2)
+    return cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_2)
@@ -0,0 +1,104 @@
+"""
+Streaming capture uploads.
+
+Image uploads are written to a temporary file inside MEDIA_ROOT in fixed-size
+chunks, so a capture never has to be held in memory whole. Because the temp
+file already lives on the destination filesystem, accepting it is a single
+atomic `os.replace`.
+"""
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class CaptureTooLarge(ValueError):
+    pass
+
+
+def max_capture_bytes():
+    return max(1, int(getattr(settings, "KYC_CAPTURE_MAX_BYTES", 15 * 1024 * 1024)))
+
+
+def _open_temp():
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=settings.MEDIA_ROOT, prefix=".capture-", suffix=".part", delete=False)
+
+
+def discard(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def stream_to_temp(stream, max_bytes=None):
+    """Copy a readable stream into a MEDIA_ROOT temp file; returns (path, size)."""
+    max_bytes = max_bytes or max_capture_bytes()
+    size = 0
+    with _open_temp() as f:
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise CaptureTooLarge(f"Upload exceeds {max_bytes} bytes")
+                f.write(chunk)
+        except BaseException:
+            f.close()
+            discard(f.name)
+            raise
+    return f.name, size
+
+
+class MediaTempFileUploadHandler(FileUploadHandler):
+    """Multipart upload handler that streams file fields into MEDIA_ROOT temp files."""
+
+    chunk_size = CHUNK_SIZE
+
+    def __init__(self, request=None, max_bytes=None):
+        super().__init__(request)
+        self.max_bytes = max_bytes or max_capture_bytes()
+        self.too_large = False
+        self.temp_paths = []
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.size = 0
+        self.file = _open_temp()
+        self.temp_paths.append(self.file.name)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_bytes:
+            self.too_large = True
+            self.file.close()
+            raise StopUpload(connection_reset=False)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        self.file.close()
+        uploaded = UploadedFile(
+            file=None,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+        uploaded.temp_path = self.file.name
+        return uploaded
+
+    def upload_interrupted(self):
+        if getattr(self, "file", None) is not None:
+            self.file.close()
+
+    def cleanup(self):
+        for path in self.temp_paths:
+            discard(path)
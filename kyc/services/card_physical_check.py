@@ -1,30 +1,117 @@
 import os
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
+from django.conf import settings
+
+
+_REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    3: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# Score (0-1) at which a set of tilt frames counts as a physical card, tuned at
+# full resolution.
+VERIFIED_THRESHOLD = 0.45
+
+# Early exit: stop analysing further frames once this many are valid and the
+# provisional score clears VERIFIED_THRESHOLD by EARLY_EXIT_MARGIN.
+EARLY_EXIT_MARGIN = 0.1
+
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
 
 
 def _safe_float(value: float) -> float:
     return float(round(float(value), 4))
 
 
-def _analyze_single_frame(path: str) -> Dict[str, float]:
-    img = cv2.imread(path)
-    if img is None:
+def find_card_contour(gray: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Canny edge map and the largest external contour (the card candidate), or None."""
+    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.Canny(blur, 75, 180)
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return edges, None
+    return edges, max(contours, key=cv2.contourArea)
+
+
+def contour_edge_strength(edges: np.ndarray, contour: np.ndarray, thickness: int = 2) -> float:
+    """
+    Mean edge response (0..1) along `contour` drawn `thickness` px wide.
+
+    The contour is rasterised into a mask covering only its (padded) bounding
+    rectangle rather than the whole frame; the pixels sampled are the same.
+    """
+    h, w = edges.shape[:2]
+    x, y, cw, ch = cv2.boundingRect(contour)
+    pad = thickness
+    x0, y0 = max(0, x - pad), max(0, y - pad)
+    x1, y1 = min(w, x + cw + pad), min(h, y + ch + pad)
+    if x1 <= x0 or y1 <= y0:
+        return 0.0
+
+    mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    cv2.drawContours(mask, [contour], -1, 255, thickness=thickness, offset=(-x0, -y0))
+    samples = edges[y0:y1, x0:x1][mask > 0]
+    if samples.size == 0:
+        return 0.0
+    return float(samples.mean()) / 255.0
+
+
+def _read_gray(path: str, pyramid_level: int = 0) -> Optional[np.ndarray]:
+    """Grayscale frame at 1 / 2**pyramid_level scale (decoded reduced, not pyrDown'd)."""
+    if pyramid_level <= 0:
+        img = cv2.imread(path)
+        return None if img is None else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return cv2.imread(path, _REDUCED_GRAYSCALE_FLAGS[min(pyramid_level, 3)])
+
+
+def _analyze_single_frame(path: str, pyramid_level: int = 0) -> Dict[str, float]:
+    gray = _read_gray(path, pyramid_level)
+    if gray is None:
         return {
             "ok": 0.0,
             "edge_strength": 0.0,
             "angle": 0.0,
             "area_ratio": 0.0,
         }
+    return frame_metrics(gray)
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
-    edges = cv2.Canny(blur, 75, 180)
 
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not contours:
+def configured_pyramid_level() -> int:
+    return max(0, int(getattr(settings, "KYC_PHYSICAL_CHECK_PYRAMID_LEVEL", 0)))
+
+
+def capture_frame_metrics(path: str, preview: Optional[np.ndarray] = None, preview_level: int = 1) -> Dict[str, float]:
+    """
+    Metrics for a just-captured tilt frame at the configured pyramid level.
+
+    `preview` (decoded at `preview_level`) is reused when the levels match;
+    otherwise the stored file is decoded at the configured level. The level is
+    recorded so `analyze_card_physicality` never mixes scales.
+    """
+    level = configured_pyramid_level()
+    if preview is not None and preview_level == level:
+        metrics = frame_metrics(preview)
+    else:
+        metrics = _analyze_single_frame(path, level)
+    metrics["pyramid_level"] = level
+    return metrics
+
+
+def frame_metrics(img: np.ndarray) -> Dict[str, float]:
+    """Per-frame edge_strength / angle / area_ratio for a decoded BGR or grayscale frame."""
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    edges, candidate = find_card_contour(gray)
+    if candidate is None:
         return {
             "ok": 0.0,
             "edge_strength": 0.0,
@@ -35,7 +122,6 @@ def _analyze_single_frame(path: str) -> Dict[str, float]:
     h, w = gray.shape
     frame_area = float(max(h * w, 1))
 
-    candidate = max(contours, key=cv2.contourArea)
     contour_area = float(cv2.contourArea(candidate))
     if contour_area <= 0:
         return {
@@ -48,9 +134,7 @@ def _analyze_single_frame(path: str) -> Dict[str, float]:
     rect = cv2.minAreaRect(candidate)
     angle = float(rect[2])
 
-    mask = np.zeros_like(gray)
-    cv2.drawContours(mask, [candidate], -1, 255, thickness=2)
-    edge_strength = float(np.mean(edges[mask > 0])) / 255.0
+    edge_strength = contour_edge_strength(edges, candidate)
 
     area_ratio = contour_area / frame_area
 
@@ -62,30 +146,7 @@ def _analyze_single_frame(path: str) -> Dict[str, float]:
     }
 
 
-def analyze_card_physicality(image_paths: List[str]) -> Dict[str, float]:
-    existing_paths = [p for p in image_paths if p and os.path.exists(p)]
-    if len(existing_paths) < 1:
-        return {
-            "verified": False,
-            "physical_card_score": 0.0,
-            "edge_consistency_score": 0.0,
-            "depth_variation_score": 0.0,
-            "frames_used": len(existing_paths),
-            "reason": "not_enough_frames",
-        }
-
-    metrics = [_analyze_single_frame(path) for path in existing_paths]
-    valid = [m for m in metrics if m["ok"] > 0]
-    if len(valid) < 1:
-        return {
-            "verified": False,
-            "physical_card_score": 0.0,
-            "edge_consistency_score": 0.0,
-            "depth_variation_score": 0.0,
-            "frames_used": len(valid),
-            "reason": "card_not_detected",
-        }
-
+def _score_frames(valid: List[Dict[str, float]]) -> Dict[str, float]:
     if len(valid) == 1:
         edge_consistency = float(np.clip(valid[0]["edge_strength"], 0.0, 1.0))
         area_ratio = float(np.clip(valid[0]["area_ratio"], 0.0, 1.0))
@@ -115,7 +176,7 @@ def analyze_card_physicality(image_paths: List[str]) -> Dict[str, float]:
     depth_variation = float(np.clip((area_spread * 8.0) + (angle_spread / 60.0), 0.0, 1.0))
 
     score = float(np.clip((0.55 * edge_consistency) + (0.45 * depth_variation), 0.0, 1.0))
-    verified = score >= 0.45
+    verified = score >= VERIFIED_THRESHOLD
 
     return {
         "verified": bool(verified),
@@ -127,3 +188,159 @@ def analyze_card_physicality(image_paths: List[str]) -> Dict[str, float]:
         "angle_spread": _safe_float(angle_spread),
         "reason": "ok",
     }
+
+
+def _get_pool(workers: int) -> ThreadPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="card-physicality")
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def _timed_frame(path: str, pyramid_level: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    metrics = _analyze_single_frame(path, pyramid_level)
+    metrics["elapsed_ms"] = (time.perf_counter() - started) * 1000.0
+    metrics["frame"] = os.path.basename(path)
+    return metrics
+
+
+def _is_confident(valid: List[Dict[str, float]], min_frames: int) -> bool:
+    if min_frames <= 0 or len(valid) < max(2, min_frames):
+        return False
+    return _score_frames(valid)["physical_card_score"] >= (VERIFIED_THRESHOLD + EARLY_EXIT_MARGIN) * 100.0
+
+
+def _collect_metrics(paths: List[str], workers: int, pyramid_level: int, early_exit_frames: int, seed=()):
+    """
+    Analyse frames (in parallel when workers > 1); returns (metrics, stopped_early).
+    `seed` holds already-known valid frame metrics that count towards early exit.
+
+    Results are consumed in frame order, so an early exit always keeps the same
+    leading frames whichever thread finishes first.
+    """
+    seed = list(seed)
+    metrics: List[Dict[str, float]] = []
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            metrics.append(_timed_frame(path, pyramid_level))
+            valid = seed + [m for m in metrics if m["ok"] > 0]
+            if _is_confident(valid, early_exit_frames) and len(metrics) < len(paths):
+                return metrics, True
+        return metrics, False
+
+    # cv2 releases the GIL while decoding and filtering, so threads scale here.
+    pool = _get_pool(workers)
+    futures = [pool.submit(_timed_frame, path, pyramid_level) for path in paths]
+    stopped_early = False
+    try:
+        for future in futures:
+            metrics.append(future.result())
+            valid = seed + [m for m in metrics if m["ok"] > 0]
+            if _is_confident(valid, early_exit_frames) and len(metrics) < len(paths):
+                stopped_early = True
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    return metrics, stopped_early
+
+
+def analyze_card_physicality(
+    image_paths: List[str],
+    workers: Optional[int] = None,
+    pyramid_level: Optional[int] = None,
+    early_exit_frames: Optional[int] = None,
+    precomputed: Optional[Dict[str, Dict[str, float]]] = None,
+) -> Dict[str, float]:
+    """
+    Score how much a set of tilt frames looks like a physical card.
+
+    `precomputed` maps frame filenames to metrics recorded at capture time;
+    those recorded at the same pyramid level are aggregated without touching
+    the image. Any other frames
+    are analysed on `workers` threads at `pyramid_level` (0 is full
+    resolution, which VERIFIED_THRESHOLD was tuned at). With
+    `early_exit_frames` > 0, analysis stops once that many valid frames already
+    give a clearly verified score. Defaults come from the KYC_PHYSICAL_CHECK_*
+    settings; both shortcuts are off by default.
+    """
+    if workers is None:
+        workers = int(getattr(settings, "KYC_PHYSICAL_CHECK_WORKERS", 4))
+    if pyramid_level is None:
+        pyramid_level = configured_pyramid_level()
+    if early_exit_frames is None:
+        early_exit_frames = int(getattr(settings, "KYC_PHYSICAL_CHECK_EARLY_EXIT_FRAMES", 0))
+
+    started = time.perf_counter()
+    existing_paths = [p for p in image_paths if p and os.path.exists(p)]
+    if len(existing_paths) < 1:
+        return {
+            "verified": False,
+            "physical_card_score": 0.0,
+            "edge_consistency_score": 0.0,
+            "depth_variation_score": 0.0,
+            "frames_used": len(existing_paths),
+            "reason": "not_enough_frames",
+        }
+
+    precomputed = precomputed or {}
+    known = []
+    pending = []
+    for path in existing_paths:
+        stored = precomputed.get(os.path.basename(path))
+        # Metrics without a recorded level are not trusted; the frame is re-read.
+        if (
+            isinstance(stored, dict)
+            and "ok" in stored
+            and "pyramid_level" in stored
+            and stored["pyramid_level"] == max(0, pyramid_level)
+        ):
+            known.append(dict(stored, frame=os.path.basename(path), elapsed_ms=0.0, precomputed=True))
+        else:
+            pending.append(path)
+
+    analysed, stopped_early = _collect_metrics(
+        pending,
+        max(1, workers),
+        max(0, pyramid_level),
+        early_exit_frames,
+        seed=[m for m in known if m["ok"] > 0],
+    )
+    metrics = known + analysed
+    timing = {
+        "frame_timings_ms": [
+            {
+                "frame": m["frame"],
+                "ok": bool(m["ok"]),
+                "elapsed_ms": _safe_float(m["elapsed_ms"]),
+                "precomputed": bool(m.get("precomputed")),
+            }
+            for m in metrics
+        ],
+        "frames_precomputed": len(known),
+        "frames_analyzed": len(metrics),
+        "early_exit": stopped_early,
+        "pyramid_level": max(0, pyramid_level),
+        "elapsed_ms": _safe_float((time.perf_counter() - started) * 1000.0),
+    }
+
+    valid = [m for m in metrics if m["ok"] > 0]
+    if len(valid) < 1:
+        return {
+            "verified": False,
+            "physical_card_score": 0.0,
+            "edge_consistency_score": 0.0,
+            "depth_variation_score": 0.0,
+            "frames_used": len(valid),
+            "reason": "card_not_detected",
+            **timing,
+        }
+
+    result = _score_frames(valid)
+    result.update(timing)
+    return result
@@ -0,0 +1,106 @@
+"""
+Per-process CPU thread budgets.
+
+TensorFlow, OpenCV and the BLAS library behind numpy each size their thread
+pools to every core on the machine. With several gunicorn workers, the OCR
+daemon thread and the physicality pool in one container, that oversubscribes
+the CPU and shows up as latency spikes rather than throughput. Applying these
+limits from `KycConfig.ready()` gives each process a fixed share instead.
+
+The BLAS and TensorFlow limits are exported as environment variables, which
+the libraries read when their thread pools start (usually after Django
+setup, since nothing imports numpy or TensorFlow before the app registry is
+ready). If a library was already initialised, its runtime setter is used
+where one exists.
+"""
+import logging
+import os
+import sys
+from typing import Any, Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_BLAS_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+_APPLIED: Dict[str, Any] = {}
+
+
+def default_threads() -> int:
+    """Each web worker's share of the CPUs (`cpu_count // WEB_CONCURRENCY`)."""
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def thread_budget() -> Dict[str, int]:
+    """Resolved thread counts; `0` in a per-library setting means `KYC_COMPUTE_THREADS`."""
+    base = int(getattr(settings, "KYC_COMPUTE_THREADS", 0)) or default_threads()
+    return {
+        "tf_intra_op": int(getattr(settings, "KYC_TF_INTRA_OP_THREADS", 0)) or base,
+        "tf_inter_op": int(getattr(settings, "KYC_TF_INTER_OP_THREADS", 1)) or base,
+        "opencv": int(getattr(settings, "KYC_OPENCV_THREADS", 0)) or base,
+        "blas": int(getattr(settings, "KYC_BLAS_THREADS", 0)) or base,
+    }
+
+
+def _apply_blas(threads: int) -> str:
+    for name in _BLAS_ENV_VARS:
+        os.environ[name] = str(threads)
+    if "numpy" not in sys.modules:
+        return "env"
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        # numpy's BLAS pool already exists; the env vars only reach child processes.
+        return "env"
+    threadpool_limits(limits=threads, user_api="blas")
+    return "threadpoolctl"
+
+
+def _apply_opencv(threads: int) -> bool:
+    try:
+        import cv2
+    except ImportError:
+        return False
+    cv2.setNumThreads(threads)
+    return True
+
+
+def _apply_tensorflow(intra_op: int, inter_op: int) -> str:
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra_op)
+    os.environ["TF_NUM_INTEROP_THREADS"] = str(inter_op)
+    tf = sys.modules.get("tensorflow")
+    if tf is None:
+        return "env"
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+    except RuntimeError:
+        logger.warning("TensorFlow is already initialised; thread limits apply from the next process")
+        return "too_late"
+    return "runtime"
+
+
+def apply_compute_limits(force: bool = False) -> Dict[str, Any]:
+    """Apply `thread_budget()` to BLAS, OpenCV and TensorFlow once per process."""
+    if _APPLIED and not force:
+        return dict(_APPLIED)
+    if not getattr(settings, "KYC_COMPUTE_LIMITS", True):
+        _APPLIED.clear()
+        _APPLIED.update(enabled=False)
+        return dict(_APPLIED)
+
+    budget = thread_budget()
+    applied = {"enabled": True, **budget}
+    applied["blas_via"] = _apply_blas(budget["blas"])
+    applied["opencv_applied"] = _apply_opencv(budget["opencv"])
+    applied["tf_via"] = _apply_tensorflow(budget["tf_intra_op"], budget["tf_inter_op"])
+    _APPLIED.clear()
+    _APPLIED.update(applied)
+    logger.info("Compute thread limits: %s", applied)
+    return dict(_APPLIED)
+
+
+def compute_limits() -> Dict[str, Any]:
+    return dict(_APPLIED)
@@ -0,0 +1,144 @@
+"""
+Materialized dashboard counters.
+
+`platform_dashboard` used to run four `COUNT(*)` queries per page load, and
+on a large `kyc_sessions` table those are full scans. The counts now live in
+`kyc_dashboard_counters`, one row per (scope, name). The scope is `platform`
+or `tenant:<id>`. Write paths call `bump()` with an atomic `F()` increment,
+and `python manage.py reconcile_counters` recomputes every row from the
+source tables to correct drift (bulk deletes, admin edits, failed writes).
+
+A missing row is seeded from the source count the first time it is touched,
+so a fresh deploy needs no data migration.
+"""
+import logging
+from typing import Dict, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from ..models import DashboardCounter, Tenant, VerificationSession
+
+logger = logging.getLogger(__name__)
+
+PLATFORM = "platform"
+COUNTER_NAMES = ("tenants", "users", "sessions", "pending_reviews")
+TENANT_COUNTER_NAMES = ("users", "sessions", "pending_reviews")
+
+
+def tenant_scope(tenant) -> str:
+    tenant_id = tenant if isinstance(tenant, int) else tenant.pk
+    return f"tenant:{tenant_id}"
+
+
+def _source_count(scope: str, name: str) -> int:
+    tenant_filter = {}
+    if scope != PLATFORM:
+        tenant_filter["tenant_id"] = int(scope.split(":", 1)[1])
+    if name == "tenants":
+        return Tenant.objects.filter(deleted_at__isnull=True).count()
+    if name == "users":
+        return get_user_model().objects.filter(**tenant_filter).count()
+    if name == "sessions":
+        return VerificationSession.objects.filter(**tenant_filter).count()
+    if name == "pending_reviews":
+        return VerificationSession.objects.filter(review_status="pending", **tenant_filter).count()
+    raise ValueError(f"Unknown counter: {name}")
+
+
+def _seed(scope: str, name: str) -> int:
+    value = _source_count(scope, name)
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.create(scope=scope, name=name, value=value)
+    except IntegrityError:
+        # Another request seeded it first; its row is at least as fresh.
+        return DashboardCounter.objects.get(scope=scope, name=name).value
+    return value
+
+
+def bump(name: str, delta: int = 1, tenant=None):
+    """Add `delta` to the platform counter and, with `tenant`, to that tenant's counter."""
+    scopes = [PLATFORM]
+    if tenant is not None and name != "tenants":
+        scopes.append(tenant_scope(tenant))
+    for scope in scopes:
+        updated = DashboardCounter.objects.filter(scope=scope, name=name).update(
+            value=F("value") + delta,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            # The source row is already written, so the seeded count includes it.
+            _seed(scope, name)
+
+
+def record_session_created(tenant, review_status: str = "pending"):
+    bump("sessions", tenant=tenant)
+    if review_status == "pending":
+        bump("pending_reviews", tenant=tenant)
+
+
+def record_review_change(tenant, old_status: str, new_status: str):
+    if old_status == new_status or "pending" not in {old_status, new_status}:
+        return
+    bump("pending_reviews", 1 if new_status == "pending" else -1, tenant=tenant)
+
+
+def read_counters(tenant=None) -> Dict[str, int]:
+    """All counters for the platform (or one tenant) in a single indexed lookup."""
+    scope = PLATFORM if tenant is None else tenant_scope(tenant)
+    names = COUNTER_NAMES if tenant is None else TENANT_COUNTER_NAMES
+    values = dict(DashboardCounter.objects.filter(scope=scope).values_list("name", "value"))
+    for name in names:
+        if name not in values:
+            values[name] = _seed(scope, name)
+    return {name: values[name] for name in names}
+
+
+def _upsert(scope: str, name: str, value: int, drift: Dict[str, int]):
+    row, created = DashboardCounter.objects.get_or_create(scope=scope, name=name, defaults={"value": value})
+    if not created and row.value != value:
+        drift[f"{scope}/{name}"] = value - row.value
+        row.value = value
+        row.save(update_fields=["value", "updated_at"])
+
+
+def reconcile(tenant: Optional[Tenant] = None) -> Dict[str, int]:
+    """Recompute counters from the source tables; returns {scope/name: correction}."""
+    drift: Dict[str, int] = {}
+    User = get_user_model()
+    if tenant is not None:
+        scope = tenant_scope(tenant)
+        for name in TENANT_COUNTER_NAMES:
+            _upsert(scope, name, _source_count(scope, name), drift)
+        return drift
+
+    for name in COUNTER_NAMES:
+        _upsert(PLATFORM, name, _source_count(PLATFORM, name), drift)
+
+    per_tenant: Dict[int, Dict[str, int]] = {
+        tenant_id: dict.fromkeys(TENANT_COUNTER_NAMES, 0) for tenant_id in Tenant.objects.values_list("pk", flat=True)
+    }
+    session_rows = (
+        VerificationSession.objects.filter(tenant_id__isnull=False)
+        .values("tenant_id", "review_status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in session_rows:
+        counts = per_tenant.setdefault(row["tenant_id"], dict.fromkeys(TENANT_COUNTER_NAMES, 0))
+        counts["sessions"] += row["total"]
+        if row["review_status"] == "pending":
+            counts["pending_reviews"] += row["total"]
+    user_rows = User.objects.filter(tenant_id__isnull=False).values("tenant_id").annotate(total=Count("id")).order_by()
+    for row in user_rows:
+        per_tenant.setdefault(row["tenant_id"], dict.fromkeys(TENANT_COUNTER_NAMES, 0))["users"] = row["total"]
+
+    for tenant_id, counts in per_tenant.items():
+        for name, value in counts.items():
+            _upsert(tenant_scope(tenant_id), name, value, drift)
+    if drift:
+        logger.warning("Dashboard counters drifted: %s", drift)
+    return drift
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def image_digest(img: Any) -> str:
+    """SHA-256 of an image file's bytes or of a decoded array's pixels."""
+    digest = hashlib.sha256()
+    if isinstance(img, np.ndarray):
+        digest.update(f"{img.dtype.str}:{img.shape}".encode("ascii"))
+        digest.update(np.ascontiguousarray(img).tobytes())
+        return digest.hexdigest()
+    with open(img, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier face embedding cache keyed by (content hash, model, detector backend).
+
+    The memory tier is a size-bounded LRU. The optional disk tier stores one
+    `.npy` file per key and serves it back memory-mapped, so embeddings survive
+    worker restarts and are shared between workers on the same disk. Embeddings
+    are biometric data: disk entries older than `disk_ttl` seconds are treated as
+    misses and deleted by `purge_expired()` (run from `cleanup_kyc`).
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None, disk_ttl: float = 86400.0):
+        self.max_entries = max(0, int(max_entries))
+        self.disk_dir = disk_dir
+        self.disk_ttl = float(disk_ttl)
+        self._entries: "OrderedDict[Tuple[str, str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def _disk_path(self, key: Tuple[str, str, str]) -> str:
+        digest, model_name, detector_backend = key
+        name = _UNSAFE_NAME_RE.sub("_", f"{model_name}__{detector_backend}__{digest}")
+        return os.path.join(self.disk_dir, digest[:2], f"{name}.npy")
+
+    def _remember(self, key: Tuple[str, str, str], value: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, digest: str, model_name: str, detector_backend: str) -> Optional[np.ndarray]:
+        key = (digest, model_name, detector_backend)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return value
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                if time.time() - os.path.getmtime(path) > self.disk_ttl:
+                    os.remove(path)
+                    value = None
+                else:
+                    value = np.load(path, mmap_mode="r")
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._disk_hits += 1
+                    self._remember(key, value)
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, digest: str, model_name: str, detector_backend: str, embeddings: np.ndarray) -> None:
+        key = (digest, model_name, detector_backend)
+        value = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            self._remember(key, value)
+
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def purge_expired(self) -> int:
+        """Delete disk entries older than `disk_ttl`; returns how many were removed."""
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return 0
+        cutoff = time.time() - self.disk_ttl
+        removed = 0
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory_hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+            }
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _CACHE
+    if _CACHE is not None:
+        return _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            disk_dir = None
+            if getattr(settings, "FACE_EMBEDDING_CACHE_DISK", False):
+                disk_dir = os.path.join(settings.MEDIA_ROOT, "embedding_cache")
+            _CACHE = EmbeddingCache(
+                max_entries=int(getattr(settings, "FACE_EMBEDDING_CACHE_SIZE", 256)),
+                disk_dir=disk_dir,
+                disk_ttl=float(getattr(settings, "FACE_EMBEDDING_CACHE_DISK_TTL_SECONDS", 86400.0)),
+            )
+        return _CACHE
@@ -0,0 +1,285 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from .embedding_cache import EmbeddingCache, get_embedding_cache, image_digest
+
+logger = logging.getLogger(__name__)
+
+# Pre-tuned cosine thresholds from DeepFace, used when the installed release
+# does not expose `deepface.modules.verification.find_threshold`.
+_FALLBACK_COSINE_THRESHOLDS = {
+    "VGG-Face": 0.68,
+    "Facenet": 0.40,
+    "Facenet512": 0.30,
+    "ArcFace": 0.68,
+    "OpenFace": 0.10,
+    "DeepFace": 0.23,
+    "DeepID": 0.015,
+    "Dlib": 0.07,
+    "SFace": 0.593,
+    "GhostFaceNet": 0.65,
+}
+
+_ENGINES: Dict[str, "FaceEmbeddingEngine"] = {}
+_ENGINE_LOCK = threading.Lock()
+
+
+@dataclass
+class DetectedFaces:
+    """Aligned RGB face crops that were already detected upstream (skips re-detection)."""
+
+    faces: List[np.ndarray]
+    facial_areas: List[Dict[str, int]] = field(default_factory=list)
+
+    def digest(self) -> str:
+        return image_digest(np.concatenate([np.asarray(face).ravel() for face in self.faces]))
+
+
+def cosine_distance_matrix(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Cosine distances between every row of `source` (N, D) and `target` (M, D)."""
+    source = np.atleast_2d(np.asarray(source, dtype=np.float64))
+    target = np.atleast_2d(np.asarray(target, dtype=np.float64))
+    source_norm = np.linalg.norm(source, axis=1, keepdims=True)
+    target_norm = np.linalg.norm(target, axis=1, keepdims=True)
+    source = source / np.maximum(source_norm, 1e-12)
+    target = target / np.maximum(target_norm, 1e-12)
+    return 1.0 - (source @ target.T)
+
+
+def _find_threshold(model_name: str) -> float:
+    try:
+        from deepface.modules.verification import find_threshold
+    except ImportError:
+        return _FALLBACK_COSINE_THRESHOLDS[model_name]
+    return float(find_threshold(model_name, "cosine"))
+
+
+class FaceEmbeddingEngine:
+    """
+    Process-resident face embedding engine.
+
+    Recognition models are built once per worker and reused for every request;
+    embeddings are computed with a direct forward pass and compared with a
+    vectorized cosine distance instead of going through `DeepFace.verify`.
+    """
+
+    def __init__(
+        self,
+        detector_backend: str = "opencv",
+        normalization: str = "base",
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.detector_backend = detector_backend
+        self.normalization = normalization
+        self.cache = cache
+        self._models: Dict[str, Any] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._forward_modes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load_model(self, model_name: str) -> Any:
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                from deepface import DeepFace
+
+                model = DeepFace.build_model(model_name=model_name)
+                self._models[model_name] = model
+                self._thresholds[model_name] = _find_threshold(model_name)
+        return model
+
+    def loaded_models(self) -> List[str]:
+        return list(self._models.keys())
+
+    def threshold(self, model_name: str) -> float:
+        self.load_model(model_name)
+        return self._thresholds[model_name]
+
+    def extract_faces(self, img: Any) -> DetectedFaces:
+        """Detect and align faces in a path or BGR array."""
+        from deepface import DeepFace
+
+        faces = DeepFace.extract_faces(
+            img_path=img,
+            detector_backend=self.detector_backend,
+            enforce_detection=False,
+            align=True,
+        )
+        faces = [face for face in faces if face.get("face") is not None]
+        return DetectedFaces(
+            faces=[face["face"] for face in faces],
+            facial_areas=[face.get("facial_area") or {} for face in faces],
+        )
+
+    def detect_faces(self, img: Any) -> List[np.ndarray]:
+        """Return aligned RGB face crops (float, 0..1) for a path, BGR array or `DetectedFaces`."""
+        if isinstance(img, DetectedFaces):
+            return list(img.faces)
+        return self.extract_faces(img).faces
+
+    def preprocess(self, face: np.ndarray, model_name: str) -> np.ndarray:
+        """Build a (1, H, W, 3) model input from an aligned RGB face crop."""
+        from deepface.modules import preprocessing
+
+        model = self.load_model(model_name)
+        target_h, target_w = model.input_shape
+        img = face[:, :, ::-1]
+        img = preprocessing.resize_image(img=img, target_size=(target_w, target_h))
+        return preprocessing.normalize_input(img=img, normalization=self.normalization)
+
+    def forward(self, batch: np.ndarray, model_name: str) -> np.ndarray:
+        model = self.load_model(model_name)
+        mode = self._forward_modes.get(model_name)
+        if mode is None:
+            if batch.shape[0] < 2:
+                return np.atleast_2d(np.asarray(model.forward(batch), dtype=np.float32))
+            return self._detect_forward_mode(model, batch, model_name)
+        if mode == "batch":
+            return np.atleast_2d(np.asarray(model.forward(batch), dtype=np.float32))
+        if mode == "keras":
+            return np.asarray(model.model(batch, training=False), dtype=np.float32)
+        return self._forward_rows(model, batch)
+
+    def _forward_rows(self, model: Any, batch: np.ndarray) -> np.ndarray:
+        return np.stack(
+            [np.asarray(model.forward(batch[i:i + 1]), dtype=np.float32).reshape(-1) for i in range(batch.shape[0])]
+        )
+
+    def _detect_forward_mode(self, model: Any, batch: np.ndarray, model_name: str) -> np.ndarray:
+        """
+        Run the first multi-row batch and remember how this model takes batches.
+
+        DeepFace's `forward` returns only the first row for a batch, so the
+        full-batch result is used directly when it has every row. Otherwise
+        the underlying Keras model is called once; only if that fails too
+        are later batches run row by row. Either way the probe runs once per
+        model, not on every request.
+        """
+        embeddings = np.atleast_2d(np.asarray(model.forward(batch), dtype=np.float32))
+        if embeddings.shape[0] == batch.shape[0]:
+            self._forward_modes[model_name] = "batch"
+            return embeddings
+
+        keras_model = getattr(model, "model", None)
+        if callable(keras_model):
+            try:
+                embeddings = np.asarray(keras_model(batch, training=False), dtype=np.float32)
+            except Exception:
+                logger.debug("Direct batch call failed for %s", model_name, exc_info=True)
+            else:
+                if embeddings.ndim == 2 and embeddings.shape[0] == batch.shape[0]:
+                    self._forward_modes[model_name] = "keras"
+                    return embeddings
+
+        self._forward_modes[model_name] = "rows"
+        return self._forward_rows(model, batch)
+
+    def embed(self, img: Any, model_name: str) -> np.ndarray:
+        """Embeddings (N, D) for every face detected in `img`."""
+        faces = self.detect_faces(img)
+        if not faces:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.embed_faces(faces, model_name)
+
+    def embed_faces(self, faces: Sequence[np.ndarray], model_name: str) -> np.ndarray:
+        """Embeddings for already-detected faces, run as a single forward batch."""
+        batch = np.concatenate([self.preprocess(face, model_name) for face in faces], axis=0)
+        return self.forward(batch, model_name)
+
+    def verify(self, img1: Any, img2: Any, model_name: str) -> Dict[str, Any]:
+        """Mirror of `DeepFace.verify(..., distance_metric="cosine")` for one model."""
+        return self.verify_models(img1, img2, [model_name])[0]
+
+    def verify_models(self, img1: Any, img2: Any, model_names: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Batched ensemble verification.
+
+        Each image is decoded and detected once; every model then embeds the
+        shared aligned crops of both images in one forward batch. Embeddings
+        already in the cache skip detection and inference entirely.
+        """
+        embeddings = self.embed_images([img1, img2], model_names)
+        results = []
+        for model_name in model_names:
+            distance = float(np.min(cosine_distance_matrix(embeddings[0][model_name], embeddings[1][model_name])))
+            threshold = self.threshold(model_name)
+            results.append(
+                {
+                    "model": model_name,
+                    "distance": distance,
+                    "threshold": threshold,
+                    "verified": distance <= threshold,
+                }
+            )
+        return results
+
+    def embed_images(self, images: Sequence[Any], model_names: Sequence[str]) -> List[Dict[str, np.ndarray]]:
+        """Per-image {model_name: (N, D) embeddings}, batching cache misses per model."""
+        digests = [None] * len(images)
+        if self.cache is not None:
+            digests = [img.digest() if isinstance(img, DetectedFaces) else image_digest(img) for img in images]
+        faces: List[Optional[List[np.ndarray]]] = [None] * len(images)
+        out: List[Dict[str, np.ndarray]] = [{} for _ in images]
+
+        for model_name in model_names:
+            pending = []
+            for index, digest in enumerate(digests):
+                cached = None
+                if digest is not None:
+                    cached = self.cache.get(digest, model_name, self.detector_backend)
+                if cached is not None:
+                    out[index][model_name] = cached
+                else:
+                    pending.append(index)
+            if not pending:
+                continue
+
+            for index in pending:
+                if faces[index] is None:
+                    faces[index] = self.detect_faces(images[index])
+                if not faces[index]:
+                    raise ValueError("Face could not be detected in one of the images")
+
+            batch_faces = [face for index in pending for face in faces[index]]
+            batch_embeddings = self.embed_faces(batch_faces, model_name)
+            offset = 0
+            for index in pending:
+                count = len(faces[index])
+                image_embeddings = batch_embeddings[offset:offset + count]
+                offset += count
+                out[index][model_name] = image_embeddings
+                if digests[index] is not None:
+                    self.cache.put(digests[index], model_name, self.detector_backend, image_embeddings)
+        return out
+
+
+def get_face_engine(detector_backend: Optional[str] = None) -> FaceEmbeddingEngine:
+    """
+    Process-wide engine. With `KYC_INFERENCE_BACKEND=sidecar` this is a client
+    for the local inference process (see `inference_sidecar`) instead.
+    """
+    backend = detector_backend or getattr(settings, "FACE_DETECTOR_BACKEND", "opencv")
+    use_sidecar = getattr(settings, "KYC_INFERENCE_BACKEND", "local") == "sidecar"
+    key = f"sidecar:{backend}" if use_sidecar else backend
+    engine = _ENGINES.get(key)
+    if engine is not None:
+        return engine
+    with _ENGINE_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            if use_sidecar:
+                from .inference_sidecar import get_remote_engine
+
+                engine = get_remote_engine()
+            else:
+                engine = FaceEmbeddingEngine(detector_backend=backend, cache=get_embedding_cache())
+            _ENGINES[key] = engine
+        return engine
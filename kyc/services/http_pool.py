@@ -0,0 +1,173 @@
+import base64
+import http.client
+import queue
+import select
+import threading
+import urllib.request
+from urllib.parse import unquote, urlsplit
+
+
+# Errors that mean an idle keep-alive connection was closed by the server
+# before we reused it. If they happen while the request is being written the
+# server cannot have processed it, so it is retried once on a fresh connection.
+# After the request was written only idempotent methods are retried: a POST may
+# already have been processed (and billed), so the error goes to the caller.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _proxy_for(scheme, host):
+    """Proxy URL from the environment (`HTTPS_PROXY`, `HTTP_PROXY`, `NO_PROXY`) for this host, or None."""
+    if urllib.request.proxy_bypass(host):
+        return None
+    return urllib.request.getproxies().get(scheme)
+
+
+class HTTPConnectionPool:
+    """
+    Small keep-alive connection pool for a single scheme/host/port.
+
+    Connections (and therefore TCP + TLS handshakes) are reused across
+    requests; at most `pool_size` idle connections are kept. Environment
+    proxies are honoured like urllib does: HTTPS goes through a CONNECT
+    tunnel, plain HTTP sends absolute URLs to the proxy. Redirects are not
+    followed; a 3xx is returned to the caller as is.
+    """
+
+    def __init__(self, base_url, pool_size=4, ssl_context=None, proxy_url=None):
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"}:
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme!r}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.pool_size = max(1, int(pool_size))
+        self.ssl_context = ssl_context
+        self._idle = queue.LifoQueue(maxsize=self.pool_size)
+        self._lock = threading.Lock()
+        self.connections_created = 0
+
+        self.proxy = None
+        self._proxy_headers = {}
+        proxy_url = proxy_url or _proxy_for(self.scheme, self.host)
+        if proxy_url:
+            proxy = urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+            self.proxy = (proxy.hostname, proxy.port or 80)
+            if proxy.username:
+                credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+                token = base64.b64encode(credentials.encode()).decode("ascii")
+                self._proxy_headers["Proxy-Authorization"] = f"Basic {token}"
+
+    def _new_connection(self, timeout):
+        with self._lock:
+            self.connections_created += 1
+        if self.proxy is None:
+            if self.scheme == "https":
+                return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.ssl_context)
+            return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+        proxy_host, proxy_port = self.proxy
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout, context=self.ssl_context)
+            conn.set_tunnel(self.host, self.port, headers=self._proxy_headers)
+            return conn
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+
+    def _target(self, path):
+        if self.proxy is not None and self.scheme == "http":
+            # A plain-HTTP proxy needs the absolute URL in the request line.
+            return f"http://{self.host}:{self.port}{path}"
+        return path
+
+    @staticmethod
+    def _is_dropped(conn):
+        """An idle connection whose socket is readable has been closed by the server."""
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _get_connection(self, timeout):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._new_connection(timeout), False
+            if not self._is_dropped(conn):
+                break
+            conn.close()
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(self, method, path, body=None, headers=None, timeout=25):
+        """Send a request and return (status, response bytes)."""
+        url_path = self._target(f"{self.base_path}{path}")
+        if self.proxy is not None and self.scheme == "http":
+            headers = {**self._proxy_headers, **(headers or {})}
+        conn, reused = self._get_connection(timeout)
+        written = False
+        try:
+            try:
+                conn.request(method, url_path, body=body, headers=headers or {})
+                written = True
+                response = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused or (written and method.upper() not in _IDEMPOTENT_METHODS):
+                    raise
+                conn.close()
+                conn = self._new_connection(timeout)
+                conn.request(method, url_path, body=body, headers=headers or {})
+                response = conn.getresponse()
+            status = response.status
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def get_pool(base_url, pool_size=4, ssl_context=None):
+    """Process-wide pool per (base URL, pool size, SSL context)."""
+    key = (base_url, int(pool_size), id(ssl_context))
+    pool = _POOLS.get(key)
+    if pool is not None:
+        return pool
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = HTTPConnectionPool(base_url, pool_size=pool_size, ssl_context=ssl_context)
+            _POOLS[key] = pool
+        return pool
@@ -0,0 +1,78 @@
+import struct
+from typing import BinaryIO, Tuple
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers carry the frame size; C4 (DHT), C8 (JPG) and
+# CC (DAC) share the range but are not frames.
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated image header")
+    return data
+
+
+def _jpeg_size(f: BinaryIO) -> Tuple[int, int]:
+    f.seek(2)
+    while True:
+        byte = _read_exact(f, 1)
+        if byte != b"\xff":
+            raise ValueError("Corrupt JPEG marker")
+        marker = _read_exact(f, 1)[0]
+        while marker == 0xFF:  # fill bytes
+            marker = _read_exact(f, 1)[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:
+            raise ValueError("JPEG has no frame header")
+        (length,) = struct.unpack(">H", _read_exact(f, 2))
+        if length < 2:
+            raise ValueError("Corrupt JPEG segment")
+        if marker in _JPEG_SOF_MARKERS:
+            _, height, width = struct.unpack(">BHH", _read_exact(f, 5))
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def read_image_header(f: BinaryIO) -> Tuple[str, int, int]:
+    """
+    Return (format, width, height) from the first bytes of a JPEG, PNG or WebP
+    file without decoding pixel data. Raises ValueError for anything else.
+    """
+    f.seek(0)
+    head = f.read(32)
+    if head.startswith(b"\xff\xd8"):
+        width, height = _jpeg_size(f)
+        fmt = "jpeg"
+    elif head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", head[16:24])
+        fmt = "png"
+    elif head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", head[26:30])
+            width, height = width & 0x3FFF, height & 0x3FFF
+        elif chunk == b"VP8L":
+            (bits,) = struct.unpack("<I", head[21:25])
+            width, height = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        elif chunk == b"VP8X":
+            width = 1 + int.from_bytes(head[24:27], "little")
+            height = 1 + int.from_bytes(head[27:30], "little")
+        else:
+            raise ValueError("Unsupported WebP chunk")
+        fmt = "webp"
+    else:
+        raise ValueError("Unsupported image format")
+
+    if width <= 0 or height <= 0:
+        raise ValueError("Invalid image dimensions")
+    return fmt, int(width), int(height)
+
+
+def read_image_size(path: str) -> Tuple[str, int, int]:
+    with open(path, "rb") as f:
+        return read_image_header(f)
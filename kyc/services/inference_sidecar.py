@@ -0,0 +1,328 @@
+"""
+Local face inference sidecar.
+
+`python manage.py run_inference_server` runs one process that owns the face
+models and serves `extract_faces`, `verify_models` and `embed_images` over a
+Unix socket (`multiprocessing.connection`, authenticated with an HMAC key).
+With `KYC_INFERENCE_BACKEND=sidecar`, `get_face_engine()` returns a
+`RemoteFaceEngine` client instead of loading TensorFlow in the web worker.
+
+Inside the sidecar, every forward pass goes through a single `MicroBatcher`
+thread. Requests arriving within `KYC_INFERENCE_BATCH_WINDOW_MS` of each other
+are merged into one batch per model, even when they come from different
+sessions. At most `KYC_INFERENCE_QUEUE_SIZE` requests are admitted at once;
+callers beyond that get an immediate "busy" reply (`InferenceBusy`) instead
+of queueing without bound.
+"""
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import Any, Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+from django.conf import settings
+
+from .embedding_cache import get_embedding_cache
+from .face_engine import FaceEmbeddingEngine
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBusy(RuntimeError):
+    """The sidecar's request queue is full; retry later."""
+
+
+class RemoteInferenceError(RuntimeError):
+    pass
+
+
+def sidecar_address() -> str:
+    return getattr(settings, "KYC_INFERENCE_SOCKET", "") or "/tmp/moonkyc-inference.sock"
+
+
+def sidecar_authkey() -> bytes:
+    key = getattr(settings, "KYC_INFERENCE_AUTHKEY", "") or settings.SECRET_KEY
+    return hashlib.sha256(f"kyc-inference:{key}".encode("utf-8")).digest()
+
+
+class MicroBatcher:
+    """Coalesce concurrent embedding requests into one forward batch per model."""
+
+    def __init__(self, run_batch, max_batch: int = 32, window_seconds: float = 0.005):
+        self.run_batch = run_batch
+        self.max_batch = max(1, int(max_batch))
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.batches = 0
+        self.requests = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="kyc-inference-batcher")
+        self._thread.start()
+
+    def submit(self, faces: Sequence[np.ndarray], model_name: str) -> np.ndarray:
+        future: Future = Future()
+        self._queue.put((model_name, list(faces), future))
+        return future.result()
+
+    def _gather(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][1])
+        deadline = time.monotonic() + self.window_seconds
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[1])
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._gather()
+            by_model: "OrderedDict[str, List]" = OrderedDict()
+            for item in batch:
+                by_model.setdefault(item[0], []).append(item)
+
+            for model_name, jobs in by_model.items():
+                faces = [face for _, job_faces, _ in jobs for face in job_faces]
+                try:
+                    embeddings = self.run_batch(faces, model_name)
+                except Exception as exc:
+                    for _, _, future in jobs:
+                        future.set_exception(exc)
+                    continue
+                offset = 0
+                for _, job_faces, future in jobs:
+                    future.set_result(embeddings[offset:offset + len(job_faces)])
+                    offset += len(job_faces)
+            self.batches += 1
+            self.requests += len(batch)
+
+
+class BatchingFaceEngine(FaceEmbeddingEngine):
+    """Face engine whose forward passes are micro-batched across concurrent callers."""
+
+    def __init__(self, *args, max_batch: int = 32, window_seconds: float = 0.005, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batcher = MicroBatcher(
+            lambda faces, model_name: FaceEmbeddingEngine.embed_faces(self, faces, model_name),
+            max_batch=max_batch,
+            window_seconds=window_seconds,
+        )
+
+    def embed_faces(self, faces: Sequence[np.ndarray], model_name: str) -> np.ndarray:
+        return self.batcher.submit(faces, model_name)
+
+
+class InferenceServer:
+    def __init__(self, engine: BatchingFaceEngine, address: str = None, authkey: bytes = None, queue_size: int = 16):
+        self.engine = engine
+        self.address = address or sidecar_address()
+        self.authkey = authkey or sidecar_authkey()
+        self.queue_size = max(1, int(queue_size))
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._listener = None
+        self._stopping = threading.Event()
+        self._handlers = {
+            "extract_faces": engine.extract_faces,
+            "verify_models": engine.verify_models,
+            "embed_images": engine.embed_images,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "in_flight": in_flight,
+            "queue_size": self.queue_size,
+            "rejected": self.rejected,
+            "batches": self.engine.batcher.batches,
+            "batched_requests": self.engine.batcher.requests,
+            "models": self.engine.loaded_models(),
+        }
+
+    def dispatch(self, request: Dict[str, Any]):
+        op = request.get("op")
+        if op == "ping":
+            return ("ok", self.stats())
+        handler = self._handlers.get(op)
+        if handler is None:
+            return ("error", "ValueError", f"Unknown inference op: {op!r}")
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return ("busy", f"Inference queue is full ({self.queue_size} requests in flight)")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return ("ok", handler(**(request.get("args") or {})))
+        except Exception as exc:
+            return ("error", type(exc).__name__, str(exc)[:2000])
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(self.dispatch(request))
+                except (OSError, ValueError):
+                    return
+
+    def serve_forever(self, ready_event: threading.Event = None):
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        os.chmod(self.address, 0o600)
+        if ready_event is not None:
+            ready_event.set()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except AuthenticationError:
+                    logger.warning("Rejected inference client with a bad auth key")
+                    continue
+                if self._stopping.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def stop(self):
+        """Stop `serve_forever` from another thread."""
+        self._stopping.set()
+        try:
+            # Wake the blocking accept() so the loop sees the flag.
+            Client(self.address, family="AF_UNIX", authkey=self.authkey).close()
+        except OSError:
+            pass
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+
+class RemoteFaceEngine:
+    """Client for the inference sidecar with the same surface views use on `FaceEmbeddingEngine`."""
+
+    def __init__(self, address: str = None, authkey: bytes = None, timeout: float = 60.0):
+        self.address = address or sidecar_address()
+        self.authkey = authkey or sidecar_authkey()
+        self.timeout = float(timeout)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _call(self, op: str, **args):
+        reply = None
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send({"op": op, "args": args})
+                ready = conn.poll(self.timeout)
+                if ready:
+                    reply = conn.recv()
+            except (EOFError, OSError):
+                # A kept-alive connection may have been closed by a sidecar restart.
+                self._drop_connection()
+                if attempt:
+                    raise
+                continue
+            if not ready:
+                self._drop_connection()
+                raise TimeoutError(f"Inference sidecar did not answer {op!r} within {self.timeout}s")
+            break
+
+        status = reply[0]
+        if status == "ok":
+            return reply[1]
+        if status == "busy":
+            raise InferenceBusy(reply[1])
+        exc_type, message = reply[1], reply[2]
+        if exc_type == "ValueError":
+            raise ValueError(message)
+        raise RemoteInferenceError(f"{exc_type}: {message}")
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call("ping")
+
+    def extract_faces(self, img: Any):
+        return self._call("extract_faces", img=img)
+
+    def verify_models(self, img1: Any, img2: Any, model_names: Sequence[str]) -> List[Dict[str, Any]]:
+        return self._call("verify_models", img1=img1, img2=img2, model_names=list(model_names))
+
+    def verify(self, img1: Any, img2: Any, model_name: str) -> Dict[str, Any]:
+        return self.verify_models(img1, img2, [model_name])[0]
+
+    def embed_images(self, images: Sequence[Any], model_names: Sequence[str]) -> List[Dict[str, np.ndarray]]:
+        return self._call("embed_images", images=list(images), model_names=list(model_names))
+
+
+def shrink_for_transport(img: np.ndarray, max_edge: int = None) -> Tuple[np.ndarray, float]:
+    """
+    Downscale `img` so its long edge is at most `max_edge` (default
+    `KYC_INFERENCE_MAX_IMAGE_EDGE`; 0 disables) before it is pickled over the
+    socket. Returns the image and the factor applied to its coordinates.
+    """
+    if max_edge is None:
+        max_edge = int(getattr(settings, "KYC_INFERENCE_MAX_IMAGE_EDGE", 1280))
+    long_edge = max(img.shape[:2])
+    if max_edge <= 0 or long_edge <= max_edge:
+        return img, 1.0
+    scale = max_edge / float(long_edge)
+    size = (max(1, round(img.shape[1] * scale)), max(1, round(img.shape[0] * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA), scale
+
+
+def build_sidecar_engine(max_batch: int = None, window_ms: float = None) -> BatchingFaceEngine:
+    if max_batch is None:
+        max_batch = int(getattr(settings, "KYC_INFERENCE_MAX_BATCH", 32))
+    if window_ms is None:
+        window_ms = float(getattr(settings, "KYC_INFERENCE_BATCH_WINDOW_MS", 5.0))
+    return BatchingFaceEngine(
+        detector_backend=getattr(settings, "FACE_DETECTOR_BACKEND", "opencv"),
+        cache=get_embedding_cache(),
+        max_batch=max_batch,
+        window_seconds=window_ms / 1000.0,
+    )
+
+
+def get_remote_engine() -> RemoteFaceEngine:
+    return RemoteFaceEngine(timeout=float(getattr(settings, "KYC_INFERENCE_TIMEOUT", 60.0)))
@@ -1,28 +1,33 @@
 import base64
+import functools
+import http.client
 import json
 import os
-import itertools
-import queue
 import re
 import ssl
 import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from urllib import error, request
 
 from django.conf import settings
+from django.db import transaction
 import certifi
 
+from . import http_pool, ocr_cache, ocr_queue
+from .embedding_cache import image_digest
+from .ocr_preprocess import prepare_ocr_image
+from .rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
 _RATE_LIMIT_LOCK = threading.Lock()
-_LAST_MISTRAL_CALL_AT = 0.0
-_OCR_QUEUE = queue.PriorityQueue()
+_RATE_LIMITER = None
+_SIDE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mistral-ocr-side")
 _WORKER_THREAD = None
 _WORKER_LOCK = threading.Lock()
-_JOB_SEQ = itertools.count()
 _POSTAL_ONLY_RE = re.compile(r"^\s*〒?\s*\d{3}-?\d{4,}\s*$")
 _ADDRESS_LOW_DETAIL_RE = re.compile(r"^[\d\s\-〒,./]+$")
 
@@ -153,23 +158,32 @@ def _parse_json_block(text):
         return {}
 
 
-def _to_base64(path):
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode("ascii")
+def _to_base64(data):
+    return base64.b64encode(data).decode("ascii")
 
 
 def _build_ssl_context():
     verify_ssl = bool(getattr(settings, "MISTRAL_SSL_VERIFY", True))
+    explicit_bundle = (getattr(settings, "MISTRAL_CA_BUNDLE", "") or "").strip()
+    return _cached_ssl_context(verify_ssl, explicit_bundle)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_ssl_context(verify_ssl, explicit_bundle):
+    # Parsing the CA bundle is expensive; build each distinct context once per process.
     if not verify_ssl:
         return ssl._create_unverified_context()
-
-    explicit_bundle = (getattr(settings, "MISTRAL_CA_BUNDLE", "") or "").strip()
     if explicit_bundle:
         return ssl.create_default_context(cafile=explicit_bundle)
-
     return ssl.create_default_context(cafile=certifi.where())
 
 
+def _get_http_pool(base_url):
+    pool_size = max(1, int(getattr(settings, "MISTRAL_HTTP_POOL_SIZE", 4)))
+    ssl_context = _build_ssl_context() if base_url.startswith("https://") else None
+    return http_pool.get_pool(base_url, pool_size=pool_size, ssl_context=ssl_context)
+
+
 def _request_mistral_ocr(image_path, document_type, side_hint="unknown"):
     api_key = getattr(settings, "MISTRAL_API_KEY", "").strip()
     base_url = getattr(settings, "MISTRAL_BASE_URL", "https://api.mistral.ai/v1").rstrip("/")
@@ -181,7 +195,15 @@ def _request_mistral_ocr(image_path, document_type, side_hint="unknown"):
     if not os.path.exists(image_path):
         return {"ok": False, "error": "document image not found"}
 
-    image_b64 = _to_base64(image_path)
+    image_bytes, preprocess = prepare_ocr_image(image_path)
+    logger.info(
+        "OCR upload %s: %s -> %s bytes (saved %s)",
+        side_hint,
+        preprocess["original_bytes"],
+        preprocess["upload_bytes"],
+        preprocess["bytes_saved"],
+    )
+    image_b64 = _to_base64(image_bytes)
     prompt = (
         "You are an eKYC OCR assistant. Extract document fields from the image.\n"
         "Rules:\n"
@@ -256,43 +278,42 @@ def _request_mistral_ocr(image_path, document_type, side_hint="unknown"):
         },
     }
 
-    req = request.Request(
-        url=f"{base_url}/ocr",
-        data=_json_dumps(payload),
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        method="POST",
-    )
-    ssl_context = _build_ssl_context()
     try:
-        with request.urlopen(req, timeout=timeout, context=ssl_context) as resp:
-            raw = resp.read().decode("utf-8")
-    except error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="ignore")
-        return {"ok": False, "error": f"Mistral HTTP {exc.code}", "details": body[:500]}
-    except error.URLError as exc:
-        reason = exc.reason
-        if isinstance(reason, Exception):
-            reason_text = f"{type(reason).__name__}: {reason}"
-        else:
-            reason_text = str(reason or "network error")
-        return {"ok": False, "error": "Mistral network error", "details": reason_text[:500]}
+        status, body = _get_http_pool(base_url).request(
+            "POST",
+            "/ocr",
+            body=_json_dumps(payload),
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=timeout,
+        )
     except TimeoutError:
         return {
             "ok": False,
             "error": "Mistral timeout",
             "details": f"No response within {timeout}s. Increase MISTRAL_REQUEST_TIMEOUT or check network.",
         }
+    except (OSError, http.client.HTTPException) as exc:
+        reason_text = f"{type(exc).__name__}: {exc}"
+        return {"ok": False, "error": "Mistral network error", "details": reason_text[:500]}
     except Exception as exc:
         msg = str(exc).strip() or repr(exc)
         return {"ok": False, "error": f"Mistral request failed ({type(exc).__name__})", "details": msg[:500]}
 
+    if status >= 400:
+        return {
+            "ok": False,
+            "error": f"Mistral HTTP {status}",
+            "details": body.decode("utf-8", errors="ignore")[:500],
+            "preprocess": preprocess,
+        }
+
     try:
-        parsed = json.loads(raw)
+        parsed = json.loads(body.decode("utf-8"))
     except json.JSONDecodeError:
-        return {"ok": False, "error": "Invalid JSON response from Mistral"}
+        return {"ok": False, "error": "Invalid JSON response from Mistral", "preprocess": preprocess}
 
     extracted = {}
     annotation = parsed.get("document_annotation")
@@ -355,6 +376,7 @@ def _request_mistral_ocr(image_path, document_type, side_hint="unknown"):
         "quality_flags": quality_flags,
         "raw_confidence": raw_confidence,
         "confidence": confidence,
+        "preprocess": preprocess,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
@@ -486,17 +508,17 @@ def build_identity_assist(face_similarity, liveness_verified, customer, ocr_resu
     }
 
 
-def _respect_mistral_interval():
-    global _LAST_MISTRAL_CALL_AT
-    min_interval = max(0.0, float(getattr(settings, "MISTRAL_MIN_INTERVAL_SECONDS", 1.0)))
-    if min_interval <= 0:
-        return
+def _get_rate_limiter():
+    global _RATE_LIMITER
+    rate = max(0.0, float(getattr(settings, "MISTRAL_RATE_LIMIT_PER_SECOND", 1.0)))
+    burst = max(1.0, float(getattr(settings, "MISTRAL_RATE_LIMIT_BURST", 2)))
+    state_path = (getattr(settings, "MISTRAL_RATE_LIMIT_STATE_FILE", "") or "").strip() or None
     with _RATE_LIMIT_LOCK:
-        now = time.monotonic()
-        wait_for = (_LAST_MISTRAL_CALL_AT + min_interval) - now
-        if wait_for > 0:
-            time.sleep(wait_for)
-        _LAST_MISTRAL_CALL_AT = time.monotonic()
+        limiter = _RATE_LIMITER
+        if limiter is None or (limiter.rate, limiter.burst, limiter.state_path) != (rate, burst, state_path):
+            limiter = TokenBucket(rate=rate, burst=burst, state_path=state_path)
+            _RATE_LIMITER = limiter
+        return limiter
 
 
 def _is_rate_limited(result):
@@ -513,7 +535,7 @@ def extract_with_mistral(image_path, document_type, side_hint="unknown"):
 
     last_result = None
     for attempt in range(max_retries + 1):
-        _respect_mistral_interval()
+        _get_rate_limiter().acquire()
         result = _request_mistral_ocr(image_path=image_path, document_type=document_type, side_hint=side_hint)
         last_result = result
         if result.get("ok"):
@@ -524,114 +546,164 @@ def extract_with_mistral(image_path, document_type, side_hint="unknown"):
     return last_result or {"ok": False, "error": "Mistral request failed", "details": "unknown error"}
 
 
-def _process_ocr_job(job):
+def _reuse_side_result(tenant_id, image_path, model, document_type, side, partial=None):
+    """Return (image digest, earlier successful result or None) for one document side."""
+    if not image_path or not os.path.exists(image_path):
+        return None, None
+    digest = image_digest(image_path)
+    if partial and partial.get("image_sha256") == digest and (partial.get("result") or {}).get("ok"):
+        return digest, dict(partial["result"], cached=True)
+    cached = ocr_cache.lookup(tenant_id, digest, model, document_type, side)
+    if cached is not None:
+        return digest, dict(cached, cached=True)
+    return digest, None
+
+
+def _process_ocr_job(job, worker_id=None):
+    """
+    Run OCR for one queued job row and persist the outcome on its session.
+
+    The Mistral calls happen outside any transaction; the session write and the
+    job state transition then commit together, and are rolled back if this
+    worker no longer owns the job (so a reclaimed job is never applied twice).
+    """
     from kyc.models import VerificationSession
 
-    session_id = job.get("session_id")
-    tenant_id = job.get("tenant_id")
-    front_path = job.get("front_path")
-    back_path = job.get("back_path")
-    document_type = job.get("document_type")
-    enable_back_ocr = bool(job.get("enable_back_ocr", False))
+    payload = job.payload
+    session_id = payload.get("session_id")
+    tenant_id = payload.get("tenant_id")
+    front_path = payload.get("front_path")
+    back_path = payload.get("back_path")
+    document_type = payload.get("document_type")
+    enable_back_ocr = bool(payload.get("enable_back_ocr", False))
 
-    front_result = extract_with_mistral(front_path, document_type=document_type, side_hint="front")
-    back_result = None
+    model = getattr(settings, "MISTRAL_OCR_MODEL", "mistral-ocr-latest").strip()
+    partial_results = payload.get("partial_results") or {}
+
+    sides = {"front": front_path}
     if enable_back_ocr and back_path and os.path.exists(back_path):
-        back_result = extract_with_mistral(back_path, document_type=document_type, side_hint="back")
+        sides["back"] = back_path
+
+    # Sides that already succeeded (earlier attempt of this job, or an identical
+    # image within the cache TTL) are reused; database lookups stay on this thread.
+    digests = {}
+    results = {}
+    for side, path in sides.items():
+        digests[side], results[side] = _reuse_side_result(
+            tenant_id, path, model, document_type, side, partial_results.get(side)
+        )
+
+    # Front and back are independent requests; issue them concurrently and let the
+    # shared token bucket decide whether both go out at once.
+    futures = {
+        side: _SIDE_POOL.submit(extract_with_mistral, path, document_type, side)
+        for side, path in sides.items()
+        if side != "front" and results[side] is None
+    }
+    if results["front"] is None:
+        results["front"] = extract_with_mistral(front_path, document_type=document_type, side_hint="front")
+    for side, future in futures.items():
+        results[side] = future.result()
+
+    for side, result in results.items():
+        if not result.get("cached"):
+            ocr_cache.store(tenant_id, digests[side], model, document_type, side, result, session_id=session_id)
+
+    front_result = results["front"]
+    back_result = results.get("back")
 
     rate_limited = _is_rate_limited(front_result) or _is_rate_limited(back_result or {})
-    queue_attempt = int(job.get("queue_attempt", 0))
+    queue_attempt = int(job.attempts)
     queue_max_attempts = max(0, int(getattr(settings, "MISTRAL_QUEUE_MAX_ATTEMPTS", 6)))
     queue_retry_base = max(1.0, float(getattr(settings, "MISTRAL_QUEUE_RETRY_BASE_SECONDS", 30.0)))
 
-    try:
-        session = VerificationSession.objects.select_related("customer").get(id=session_id, tenant_id=tenant_id)
-    except VerificationSession.DoesNotExist:
-        return
+    with transaction.atomic():
+        try:
+            session = VerificationSession.objects.select_related("customer").get(id=session_id, tenant_id=tenant_id)
+        except VerificationSession.DoesNotExist:
+            ocr_queue.complete(job.id, worker_id)
+            return
+
+        if rate_limited and queue_attempt < queue_max_attempts:
+            retry_in = queue_retry_base * (2 ** queue_attempt)
+            address_summary = _build_address_summary(front_result, back_result)
+            session_document_data = session.document_data or {}
+            session_document_data["ai_document_extraction"] = {
+                "status": "rate_limited_retry",
+                "front": front_result,
+                "back": back_result,
+                "address_summary": address_summary,
+                "queued_at": payload.get("queued_at"),
+                "processed_at": datetime.now(timezone.utc).isoformat(),
+                "retry_in_seconds": round(retry_in, 2),
+                "queue_attempt": queue_attempt + 1,
+                "queue_max_attempts": queue_max_attempts,
+            }
+            session.document_data = session_document_data
+            session.updated_at = datetime.now(timezone.utc)
+            session.save(update_fields=["document_data", "updated_at"])
+            retry_payload = dict(payload)
+            retry_payload["partial_results"] = {
+                side: {"image_sha256": digests[side], "result": result}
+                for side, result in results.items()
+                if result.get("ok")
+            }
+            if not ocr_queue.reschedule(job.id, worker_id, retry_in, payload=retry_payload, error="rate_limited"):
+                transaction.set_rollback(True)
+            return
 
-    if rate_limited and queue_attempt < queue_max_attempts:
-        retry_in = queue_retry_base * (2 ** queue_attempt)
         address_summary = _build_address_summary(front_result, back_result)
+        quality_issues = _gather_quality_issues(
+            front_result=front_result,
+            back_result=back_result,
+            address_summary=address_summary,
+            back_ocr_enabled=enable_back_ocr,
+        )
+        identity_assist = build_identity_assist(
+            face_similarity=session.verify_similarity,
+            liveness_verified=session.liveness_verified,
+            customer=session.customer,
+            ocr_result=_pick_identity_ocr_result(front_result, back_result),
+            quality_issues=quality_issues,
+        )
         session_document_data = session.document_data or {}
         session_document_data["ai_document_extraction"] = {
-            "status": "rate_limited_retry",
+            "status": "completed",
             "front": front_result,
             "back": back_result,
             "address_summary": address_summary,
-            "queued_at": job.get("queued_at"),
+            "queued_at": payload.get("queued_at"),
             "processed_at": datetime.now(timezone.utc).isoformat(),
-            "retry_in_seconds": round(retry_in, 2),
-            "queue_attempt": queue_attempt + 1,
-            "queue_max_attempts": queue_max_attempts,
         }
+        session_document_data["identity_assist"] = identity_assist
         session.document_data = session_document_data
         session.updated_at = datetime.now(timezone.utc)
         session.save(update_fields=["document_data", "updated_at"])
-        enqueue_session_ocr(
-            session_id=session_id,
-            tenant_id=tenant_id,
-            front_path=front_path,
-            back_path=back_path,
-            document_type=document_type,
-            enable_back_ocr=enable_back_ocr,
-            queue_attempt=queue_attempt + 1,
-            delay_seconds=retry_in,
-            queued_at=job.get("queued_at"),
-        )
-        return
-
-    address_summary = _build_address_summary(front_result, back_result)
-    quality_issues = _gather_quality_issues(
-        front_result=front_result,
-        back_result=back_result,
-        address_summary=address_summary,
-        back_ocr_enabled=enable_back_ocr,
+        if not ocr_queue.complete(job.id, worker_id):
+            transaction.set_rollback(True)
+
+
+def run_ocr_worker(worker_id=None, poll_interval=None, once=False, stop_event=None):
+    if poll_interval is None:
+        poll_interval = max(0.1, float(getattr(settings, "MISTRAL_OCR_POLL_SECONDS", 2.0)))
+    return ocr_queue.run_worker(
+        _process_ocr_job,
+        worker_id=worker_id,
+        poll_interval=poll_interval,
+        once=once,
+        stop_event=stop_event,
     )
-    identity_assist = build_identity_assist(
-        face_similarity=session.verify_similarity,
-        liveness_verified=session.liveness_verified,
-        customer=session.customer,
-        ocr_result=_pick_identity_ocr_result(front_result, back_result),
-        quality_issues=quality_issues,
-    )
-    session_document_data = session.document_data or {}
-    session_document_data["ai_document_extraction"] = {
-        "status": "completed",
-        "front": front_result,
-        "back": back_result,
-        "address_summary": address_summary,
-        "queued_at": job.get("queued_at"),
-        "processed_at": datetime.now(timezone.utc).isoformat(),
-    }
-    session_document_data["identity_assist"] = identity_assist
-    session.document_data = session_document_data
-    session.updated_at = datetime.now(timezone.utc)
-    session.save(update_fields=["document_data", "updated_at"])
 
 
-def _worker_loop():
-    while True:
-        next_run_at, _, job = _OCR_QUEUE.get()
-        try:
-            now = time.time()
-            if next_run_at > now:
-                _OCR_QUEUE.put((next_run_at, next(_JOB_SEQ), job))
-                time.sleep(min(next_run_at - now, 2.0))
-                continue
-            _process_ocr_job(job)
-        except Exception:
-            # Keep worker alive on job-level failures.
-            logger.exception("Mistral OCR worker job failed")
-        finally:
-            _OCR_QUEUE.task_done()
-
-
-def _ensure_worker_started():
+def ensure_ocr_worker_started():
+    """Start the embedded OCR worker thread in this process if it is enabled and not running."""
     global _WORKER_THREAD
+    if not getattr(settings, "MISTRAL_OCR_EMBEDDED_WORKER", True):
+        return
     with _WORKER_LOCK:
         if _WORKER_THREAD and _WORKER_THREAD.is_alive():
             return
-        _WORKER_THREAD = threading.Thread(target=_worker_loop, daemon=True, name="mistral-ocr-worker")
+        _WORKER_THREAD = threading.Thread(target=run_ocr_worker, daemon=True, name="mistral-ocr-worker")
         _WORKER_THREAD.start()
 
 
@@ -646,16 +718,15 @@ def enqueue_session_ocr(
     delay_seconds=0.0,
     queued_at=None,
 ):
-    _ensure_worker_started()
-    job = {
-        "session_id": session_id,
+    payload = {
+        "session_id": str(session_id),
         "tenant_id": tenant_id,
         "front_path": front_path,
         "back_path": back_path,
         "document_type": document_type,
         "enable_back_ocr": bool(enable_back_ocr),
-        "queue_attempt": int(queue_attempt),
         "queued_at": queued_at or datetime.now(timezone.utc).isoformat(),
     }
-    run_at = time.time() + max(0.0, float(delay_seconds))
-    _OCR_QUEUE.put((run_at, next(_JOB_SEQ), job))
+    job = ocr_queue.enqueue(session_id, payload, delay_seconds=delay_seconds, attempts=queue_attempt)
+    transaction.on_commit(ensure_ocr_worker_started)
+    return job
@@ -0,0 +1,86 @@
+"""
+Persistent OCR result cache.
+
+Successful Mistral results are stored in `kyc_ocr_result_cache` keyed by
+(tenant, image SHA-256, OCR model, document type, side, preprocessing
+settings) and expire after `MISTRAL_OCR_CACHE_TTL_SECONDS`. Identical
+documents re-submitted to the same tenant within the TTL, and sides that
+already succeeded before a rate-limit retry, are served from the cache instead
+of being sent (and billed) again.
+
+Entries hold extracted PII. They never match another tenant, they are deleted
+with the session that produced them, and `purge_tenant` drops them all when a
+tenant is deleted.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from kyc.models import OcrResultCache
+
+from .ocr_preprocess import preprocess_signature
+
+logger = logging.getLogger(__name__)
+
+
+def ttl_seconds():
+    return max(0.0, float(getattr(settings, "MISTRAL_OCR_CACHE_TTL_SECONDS", 7 * 24 * 3600)))
+
+
+def _key(tenant_id, digest, model, document_type, side):
+    return {
+        "tenant_id": tenant_id,
+        "image_sha256": digest,
+        "model": model or "",
+        "document_type": document_type or "",
+        "side": side or "",
+        "preprocess": preprocess_signature(),
+    }
+
+
+def lookup(tenant_id, digest, model, document_type, side):
+    """Return a cached OCR result dict, or None when missing, expired or disabled."""
+    if not tenant_id or not digest or ttl_seconds() <= 0:
+        return None
+    now = timezone.now()
+    entry = (
+        OcrResultCache.objects.filter(expires_at__gt=now, **_key(tenant_id, digest, model, document_type, side))
+        .only("id", "result")
+        .first()
+    )
+    if entry is None:
+        return None
+    OcrResultCache.objects.filter(id=entry.id).update(hits=F("hits") + 1)
+    return entry.result
+
+
+def store(tenant_id, digest, model, document_type, side, result, session_id=None):
+    """Cache a successful OCR result; failed results are never stored."""
+    ttl = ttl_seconds()
+    if not tenant_id or not digest or ttl <= 0 or not (isinstance(result, dict) and result.get("ok")):
+        return
+    expires_at = timezone.now() + timedelta(seconds=ttl)
+    key = _key(tenant_id, digest, model, document_type, side)
+    try:
+        with transaction.atomic():
+            OcrResultCache.objects.update_or_create(
+                defaults={"result": result, "expires_at": expires_at, "hits": 0, "session_id": session_id},
+                **key,
+            )
+    except IntegrityError:
+        # Another worker stored the same key first; its result is just as good.
+        logger.debug("OCR cache entry for %s already stored", digest[:12])
+
+
+def purge_expired():
+    deleted, _ = OcrResultCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def purge_tenant(tenant_id):
+    deleted, _ = OcrResultCache.objects.filter(tenant_id=tenant_id).delete()
+    return deleted
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Tuple
+
+import cv2
+from django.conf import settings
+
+from .card_physical_check import find_card_contour
+
+
+# Only crop when the detected contour plausibly is the card: it must cover a
+# meaningful share of the frame, otherwise a stray edge would cut the document.
+_MIN_CROP_AREA_RATIO = 0.2
+_CROP_MARGIN_RATIO = 0.03
+
+
+def _read_original(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _crop_to_card(img):
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    _, candidate = find_card_contour(gray)
+    if candidate is None:
+        return img, False
+    h, w = gray.shape
+    x, y, cw, ch = cv2.boundingRect(candidate)
+    if (cw * ch) < _MIN_CROP_AREA_RATIO * h * w:
+        return img, False
+    margin_x = int(cw * _CROP_MARGIN_RATIO)
+    margin_y = int(ch * _CROP_MARGIN_RATIO)
+    x0, y0 = max(0, x - margin_x), max(0, y - margin_y)
+    x1, y1 = min(w, x + cw + margin_x), min(h, y + ch + margin_y)
+    return img[y0:y1, x0:x1], True
+
+
+def _resize_to_max_edge(img, max_edge: int):
+    h, w = img.shape[:2]
+    long_edge = max(h, w)
+    if max_edge <= 0 or long_edge <= max_edge:
+        return img, False
+    scale = max_edge / float(long_edge)
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA), True
+
+
+def _preprocess_settings() -> Tuple[int, int, bool]:
+    max_edge = int(getattr(settings, "MISTRAL_OCR_MAX_EDGE", 1600))
+    quality = min(100, max(1, int(getattr(settings, "MISTRAL_OCR_JPEG_QUALITY", 85))))
+    crop_to_card = bool(getattr(settings, "MISTRAL_OCR_CROP_TO_CARD", False))
+    return max_edge, quality, crop_to_card
+
+
+def preprocess_signature() -> str:
+    """Short tag of the settings that shape the uploaded image, for cache keys."""
+    max_edge, quality, crop_to_card = _preprocess_settings()
+    return f"edge={max_edge};q={quality};crop={int(crop_to_card)}"
+
+
+def prepare_ocr_image(path: str) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Return JPEG bytes to upload for OCR plus stats about what was done.
+
+    The capture is optionally cropped to the card contour, downscaled to
+    `MISTRAL_OCR_MAX_EDGE` on its long edge and re-encoded at
+    `MISTRAL_OCR_JPEG_QUALITY`. The original bytes are sent unchanged when the
+    image cannot be decoded or re-encoding would not make it smaller.
+    """
+    max_edge, quality, crop_to_card = _preprocess_settings()
+
+    original = _read_original(path)
+    stats = {
+        "original_bytes": len(original),
+        "upload_bytes": len(original),
+        "bytes_saved": 0,
+        "resized": False,
+        "cropped": False,
+        "reencoded": False,
+    }
+
+    img = cv2.imread(path)
+    if img is None:
+        return original, stats
+    stats["original_size"] = [int(img.shape[1]), int(img.shape[0])]
+
+    if crop_to_card:
+        img, stats["cropped"] = _crop_to_card(img)
+    img, stats["resized"] = _resize_to_max_edge(img, max_edge)
+    stats["upload_size"] = [int(img.shape[1]), int(img.shape[0])]
+
+    ok, encoded = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok or encoded.nbytes >= len(original):
+        stats["upload_size"] = stats["original_size"]
+        stats["resized"] = stats["cropped"] = False
+        return original, stats
+
+    data = encoded.tobytes()
+    stats.update(
+        {
+            "upload_bytes": len(data),
+            "bytes_saved": len(original) - len(data),
+            "reencoded": True,
+        }
+    )
+    return data, stats
@@ -0,0 +1,165 @@
+"""
+Durable, database-backed OCR job queue.
+
+Jobs are rows in `kyc_ocr_jobs`. A job becomes visible to workers once its
+`run_after` time has passed; a worker claims it by flipping it to `running`
+under its own `locked_by` id. Claims use `SELECT ... FOR UPDATE SKIP LOCKED`
+where the backend supports it (Postgres, MySQL 8) and an optimistic
+compare-and-set UPDATE otherwise. Jobs whose worker died are reclaimed after
+the visibility timeout. Completion and rescheduling only apply while the
+caller still owns the lock, so a job is finished at most once.
+"""
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from kyc.models import OcrJob
+
+logger = logging.getLogger(__name__)
+
+
+def make_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _visibility_timeout():
+    return max(30.0, float(getattr(settings, "MISTRAL_OCR_VISIBILITY_TIMEOUT_SECONDS", 300.0)))
+
+
+def enqueue(session_id, payload, delay_seconds=0.0, attempts=0):
+    run_after = timezone.now() + timedelta(seconds=max(0.0, float(delay_seconds)))
+    return OcrJob.objects.create(
+        session_id=session_id,
+        payload=payload,
+        attempts=int(attempts),
+        run_after=run_after,
+    )
+
+
+def _claimable(now):
+    stale_before = now - timedelta(seconds=_visibility_timeout())
+    return OcrJob.objects.filter(
+        Q(status="queued", run_after__lte=now) | Q(status="running", locked_at__lt=stale_before)
+    ).order_by("run_after", "id")
+
+
+def claim_next(worker_id):
+    """Claim the next visible job for `worker_id`, or return None."""
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _claimable(now).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = "running"
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.save(update_fields=["status", "locked_by", "locked_at", "updated_at"])
+            return job
+
+    # Fallback (older MySQL/MariaDB, SQLite): compare-and-set on the row we saw.
+    for job_id, status, locked_by in _claimable(now).values_list("id", "status", "locked_by")[:10]:
+        claimed = OcrJob.objects.filter(id=job_id, status=status, locked_by=locked_by).update(
+            status="running",
+            locked_by=worker_id,
+            locked_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return OcrJob.objects.get(id=job_id)
+    return None
+
+
+def _owned(job_id, worker_id):
+    return OcrJob.objects.filter(id=job_id, status="running", locked_by=worker_id)
+
+
+def complete(job_id, worker_id):
+    """Mark a claimed job completed; returns False if the claim was lost."""
+    now = timezone.now()
+    return bool(
+        _owned(job_id, worker_id).update(status="completed", completed_at=now, locked_at=None, updated_at=now)
+    )
+
+
+def reschedule(job_id, worker_id, delay_seconds, payload=None, error=None):
+    """Release a claimed job back to the queue, visible again after `delay_seconds`."""
+    now = timezone.now()
+    fields = {
+        "status": "queued",
+        "run_after": now + timedelta(seconds=max(0.0, float(delay_seconds))),
+        "locked_by": None,
+        "locked_at": None,
+        "last_error": error,
+        "updated_at": now,
+    }
+    if payload is not None:
+        fields["payload"] = payload
+    return bool(_owned(job_id, worker_id).update(attempts=F("attempts") + 1, **fields))
+
+
+def fail(job_id, worker_id, error):
+    now = timezone.now()
+    return bool(
+        _owned(job_id, worker_id).update(
+            status="failed",
+            last_error=str(error)[:2000],
+            completed_at=now,
+            locked_at=None,
+            updated_at=now,
+        )
+    )
+
+
+def seconds_until_next_job(default):
+    next_run = OcrJob.objects.filter(status="queued").aggregate(next_run=Min("run_after"))["next_run"]
+    if next_run is None:
+        return default
+    return max(0.0, min(default, (next_run - timezone.now()).total_seconds()))
+
+
+def run_worker(handler, worker_id=None, poll_interval=2.0, once=False, stop_event=None):
+    """
+    Claim and process jobs until stopped.
+
+    `handler(job, worker_id)` does the work and is responsible for calling
+    `complete`/`reschedule`; unexpected exceptions retry the job with backoff
+    until `MISTRAL_QUEUE_MAX_ATTEMPTS` is reached.
+    """
+    worker_id = worker_id or make_worker_id()
+    max_attempts = max(0, int(getattr(settings, "MISTRAL_QUEUE_MAX_ATTEMPTS", 6)))
+    retry_base = max(1.0, float(getattr(settings, "MISTRAL_QUEUE_RETRY_BASE_SECONDS", 30.0)))
+    processed = 0
+
+    while not (stop_event and stop_event.is_set()):
+        try:
+            job = claim_next(worker_id)
+            if job is None:
+                if once:
+                    break
+                time.sleep(seconds_until_next_job(poll_interval) or 0.05)
+                continue
+            try:
+                handler(job, worker_id)
+            except Exception as exc:
+                logger.exception("OCR job %s failed", job.id)
+                if job.attempts < max_attempts:
+                    reschedule(job.id, worker_id, retry_base * (2 ** job.attempts), error=str(exc)[:2000])
+                else:
+                    fail(job.id, worker_id, exc)
+            processed += 1
+        except Exception:
+            # Keep the worker alive through transient database errors.
+            logger.exception("OCR worker loop error")
+            time.sleep(poll_interval)
+        finally:
+            close_old_connections()
+    return processed
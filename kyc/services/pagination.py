@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination for the admin listings.
+
+Each page is fetched with a `WHERE (created_at, id) < (last created_at, last id)`
+seek on the same index that serves the ordering, so page 500 costs the same
+as page 1. An OFFSET, by contrast, scans and discards every earlier row. A
+cursor is a signed token (`django.core.signing`) holding the sort key of a
+boundary row. It is bound to one listing, so it cannot be altered or replayed
+against another list.
+"""
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+_SALT = "kyc.pagination.cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def _parse_ordering(ordering: Sequence[str]) -> List[Tuple[str, bool]]:
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+def encode_cursor(values: Sequence[str], direction: str, scope: str) -> str:
+    return signing.dumps({"v": list(values), "d": direction, "s": scope}, salt=_SALT, compress=True)
+
+
+def decode_cursor(token: str, scope: str) -> Tuple[List[str], str]:
+    try:
+        data = signing.loads(token, salt=_SALT)
+    except signing.BadSignature as exc:
+        raise InvalidCursor("Cursor signature is invalid") from exc
+    if not isinstance(data, dict) or data.get("s") != scope or data.get("d") not in {"next", "prev"}:
+        raise InvalidCursor("Cursor does not belong to this list")
+    return list(data.get("v") or []), data["d"]
+
+
+def _row_key(obj, fields) -> List[str]:
+    meta = obj._meta
+    return [meta.get_field(name).value_to_string(obj) for name, _ in fields]
+
+
+def _seek_filter(model, fields, values, reverse: bool) -> Q:
+    """Rows strictly after `values` in the listing order (before it with `reverse`)."""
+    if len(values) != len(fields):
+        raise InvalidCursor("Cursor does not match the list ordering")
+    try:
+        parsed = [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+    except Exception as exc:
+        raise InvalidCursor("Cursor values are invalid") from exc
+
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        lookup = "lt" if descending != reverse else "gt"
+        clause = Q(**{f"{name}__{lookup}": parsed[index]})
+        for prior_index in range(index):
+            clause &= Q(**{fields[prior_index][0]: parsed[prior_index]})
+        condition |= clause
+
+    # Redundant inclusive bound on the leading column: the expanded OR alone
+    # only lets the planner seek on the equality prefix, not on the range.
+    leading, descending = fields[0]
+    bound = "lte" if descending != reverse else "gte"
+    return Q(**{f"{leading}__{bound}": parsed[0]}) & condition
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    page_size: int,
+    cursor: Optional[str] = None,
+    scope: str = "",
+) -> KeysetPage:
+    """
+    One page of `queryset` in `ordering`, which must end in a unique column
+    (e.g. `("-created_at", "-id")`). Raises `InvalidCursor` for a tampered,
+    stale or foreign cursor.
+    """
+    fields = _parse_ordering(ordering)
+    page_size = max(1, int(page_size))
+    direction = "next"
+    if cursor:
+        values, direction = decode_cursor(cursor, scope)
+        queryset = queryset.filter(_seek_filter(queryset.model, fields, values, reverse=(direction == "prev")))
+
+    if direction == "prev":
+        flipped = [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+        rows = list(queryset.order_by(*flipped)[:page_size + 1])
+    else:
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+    if direction == "prev":
+        items.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, bool(cursor)
+
+    page = KeysetPage(items=items)
+    if items and has_next:
+        page.next_cursor = encode_cursor(_row_key(items[-1], fields), "next", scope)
+    if items and has_previous:
+        page.previous_cursor = encode_cursor(_row_key(items[0], fields), "prev", scope)
+    return page
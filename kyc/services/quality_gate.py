@@ -0,0 +1,119 @@
+import logging
+import time
+from typing import Any, Dict
+
+import cv2
+import numpy as np
+from django.conf import settings
+
+from .card_physical_check import find_card_contour
+
+logger = logging.getLogger(__name__)
+
+# Frames are downscaled to this long edge (never upscaled, which would smooth
+# away the detail the sharpness check looks for), so thresholds barely depend
+# on the camera resolution and the check costs a few milliseconds per frame.
+ANALYSIS_EDGE = 512
+
+MIN_BRIGHTNESS = 40.0
+MAX_BRIGHTNESS = 220.0
+MIN_SHARPNESS = 50.0
+GLARE_LEVEL = 250
+MAX_GLARE_RATIO = 0.08
+MIN_CARD_COVERAGE = 0.15
+
+_MESSAGES = {
+    "too_dark": "Image too dark. Please ensure good lighting.",
+    "too_bright": "Image too bright. Reduce lighting or avoid glare.",
+    "blurry": "Image is blurry. Please hold steady and focus.",
+    "glare": "Glare detected on the card. Tilt it slightly away from the light.",
+    "card_too_small": "Card not detected or too far away. Fill the frame with the card.",
+}
+
+
+def analysis_frame(img: np.ndarray) -> np.ndarray:
+    """Grayscale copy of `img` with its long edge at most ANALYSIS_EDGE."""
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape
+    scale = ANALYSIS_EDGE / float(max(h, w))
+    if scale >= 1.0:
+        return gray
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def assess_frame(img: np.ndarray, check_card: bool = True) -> Dict[str, Any]:
+    """
+    Brightness, Laplacian sharpness, glare ratio and (optionally) card coverage
+    for one capture. Returns the metrics plus `passed`, `reason` and a
+    user-facing `message` for the first failed check.
+    """
+    started = time.perf_counter()
+    gray = analysis_frame(img)
+
+    brightness = float(gray.mean())
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    glare_ratio = float(np.count_nonzero(gray >= GLARE_LEVEL)) / float(gray.size)
+
+    coverage = None
+    if check_card:
+        _, candidate = find_card_contour(gray)
+        if candidate is None:
+            coverage = 0.0
+        else:
+            _, _, cw, ch = cv2.boundingRect(candidate)
+            coverage = float(cw * ch) / float(gray.size)
+
+    reason = None
+    if brightness < MIN_BRIGHTNESS:
+        reason = "too_dark"
+    elif brightness > MAX_BRIGHTNESS:
+        reason = "too_bright"
+    elif sharpness < MIN_SHARPNESS:
+        reason = "blurry"
+    elif check_card and glare_ratio > MAX_GLARE_RATIO:
+        reason = "glare"
+    elif check_card and coverage < MIN_CARD_COVERAGE:
+        reason = "card_too_small"
+
+    result = {
+        "passed": reason is None,
+        "reason": reason,
+        "message": _MESSAGES[reason] if reason else "Image quality is good",
+        "brightness": round(brightness, 2),
+        "sharpness": round(sharpness, 2),
+        "glare_ratio": round(glare_ratio, 4),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+    }
+    if coverage is not None:
+        result["coverage"] = round(coverage, 4)
+    return result
+
+
+def gate_mode() -> str:
+    """`KYC_CAPTURE_QUALITY_GATE` as off, report or enforce (booleans map to enforce/off)."""
+    mode = str(getattr(settings, "KYC_CAPTURE_QUALITY_GATE", "report")).strip().lower()
+    if mode in {"1", "true", "yes", "on"}:
+        return "enforce"
+    if mode in {"0", "false", "no", "off", ""}:
+        return "off"
+    return mode if mode == "enforce" else "report"
+
+
+def capture_quality(img: np.ndarray, image_type: str) -> Dict[str, Any]:
+    """
+    The quality gate every capture endpoint runs; card coverage and glare only
+    apply to document sides.
+
+    `enforced` is True only with KYC_CAPTURE_QUALITY_GATE=enforce. In the
+    default `report` mode the metrics are returned and failures are logged, but
+    the capture is accepted.
+    """
+    mode = gate_mode()
+    if mode == "off":
+        return {"passed": True, "reason": None, "message": "Quality gate disabled", "enforced": False}
+    quality = assess_frame(img, check_card=image_type in ("front", "back"))
+    quality["enforced"] = mode == "enforce"
+    if not quality["passed"] and not quality["enforced"]:
+        logger.info("Quality gate (report only) flagged a %s capture: %s", image_type, quality["reason"])
+    return quality
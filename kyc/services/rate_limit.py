@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill at `rate` per second up to `burst`. When `state_path` is set
+    (and the platform has `fcntl`), the bucket state lives in a small JSON file
+    guarded by an exclusive `flock`, so every process on the host shares one
+    budget. Waiting happens outside the lock, so callers never serialise on
+    each other's sleeps.
+    """
+
+    def __init__(self, rate, burst=1, state_path=None):
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+
+    def _take(self, tokens, updated, now):
+        """Refill then try to take one token. Returns (tokens, updated, wait_seconds)."""
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        if tokens >= 1.0:
+            return tokens - 1.0, now, 0.0
+        return tokens, now, (1.0 - tokens) / self.rate
+
+    def _try_acquire_local(self):
+        with self._lock:
+            self._tokens, self._updated, wait = self._take(self._tokens, self._updated, time.time())
+            return wait
+
+    def _try_acquire_shared(self):
+        with self._lock:
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = b""
+                while True:
+                    chunk = os.read(fd, 4096)
+                    if not chunk:
+                        break
+                    raw += chunk
+                try:
+                    state = json.loads(raw.decode("utf-8")) if raw else {}
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens, updated, wait = self._take(
+                    float(state.get("tokens", self.burst)), float(state.get("updated", now)), now
+                )
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, json.dumps({"tokens": tokens, "updated": updated}).encode("utf-8"))
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def try_acquire(self):
+        """Take a token if one is available; otherwise return seconds until one will be."""
+        if self.rate <= 0:
+            return 0.0
+        if self.state_path:
+            try:
+                return self._try_acquire_shared()
+            except OSError:
+                pass
+        return self._try_acquire_local()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
@@ -0,0 +1,146 @@
+"""
+Per-tenant daily analytics rollups.
+
+`python manage.py refresh_rollups` finds the sessions whose `updated_at` is
+past the stored watermark and collects the (tenant, day) buckets they fall
+in. It then recomputes just those buckets from `kyc_sessions`. A session
+that changes later (verification result, review decision) is aggregated
+again in full, so runs are idempotent and overlaps are harmless. The
+watermark stops `KYC_ROLLUP_LAG_SECONDS` short of now, so rows from
+transactions that are still committing are picked up by the next run instead
+of being skipped.
+
+Deleting a session does not move the watermark, so every run also
+re-aggregates the existing rollup rows of the last `KYC_ROLLUP_REFRESH_DAYS`
+days. A bucket whose sessions are all gone is then deleted. `--full`
+re-aggregates every session bucket and every existing rollup row.
+
+Face-match rate and average similarity are relative to `checked` sessions,
+those with a `verify_similarity` from a face comparison (a score of 0 still
+counts). Liveness and physical-card
+rates are relative to all sessions of the day.
+
+Days are calendar days of `created_at` in the active time zone (`TIME_ZONE`).
+Dashboards read only `kyc_tenant_daily_rollups`.
+"""
+import datetime
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import RollupWatermark, TenantDailyRollup, VerificationSession
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "tenant_daily_rollup"
+_METRICS = ("sessions", "checked", "verified", "liveness_passed", "physical_passed", "approved", "rejected", "similarity_sum")
+
+
+def _day_bounds(day: datetime.date):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min), tz)
+    return start, start + datetime.timedelta(days=1)
+
+
+def _aggregate_day(day: datetime.date, tenant_ids: Iterable[int]) -> Dict[int, Dict[str, float]]:
+    start, end = _day_bounds(day)
+    checked = Q(verify_similarity__isnull=False)
+    rows = (
+        VerificationSession.objects.filter(tenant_id__in=list(tenant_ids), created_at__gte=start, created_at__lt=end)
+        .values("tenant_id")
+        .annotate(
+            sessions=Count("id"),
+            checked=Count("id", filter=checked),
+            verified=Count("id", filter=checked & Q(verify_verified=True)),
+            liveness_passed=Count("id", filter=Q(liveness_verified=True)),
+            physical_passed=Count("id", filter=Q(physical_card_verified=True)),
+            approved=Count("id", filter=Q(review_status="approved")),
+            rejected=Count("id", filter=Q(review_status="rejected")),
+            similarity_sum=Sum("verify_similarity", filter=checked),
+        )
+        .order_by()
+    )
+    return {row.pop("tenant_id"): row for row in rows}
+
+
+def _write_day(day: datetime.date, tenant_ids: List[int]) -> int:
+    aggregates = _aggregate_day(day, tenant_ids)
+    with transaction.atomic():
+        for tenant_id in tenant_ids:
+            values = aggregates.get(tenant_id)
+            if not values:
+                # Every session of that day was deleted.
+                TenantDailyRollup.objects.filter(tenant_id=tenant_id, day=day).delete()
+                continue
+            values["similarity_sum"] = float(values["similarity_sum"] or 0.0)
+            TenantDailyRollup.objects.update_or_create(tenant_id=tenant_id, day=day, defaults=values)
+    return len(tenant_ids)
+
+
+def refresh_rollups(full: bool = False, now: Optional[datetime.datetime] = None) -> Dict[str, object]:
+    """Re-aggregate every (tenant, day) touched since the watermark and advance it."""
+    lag = datetime.timedelta(seconds=float(getattr(settings, "KYC_ROLLUP_LAG_SECONDS", 120)))
+    high = (now or timezone.now()) - lag
+    watermark = None if full else RollupWatermark.objects.filter(name=WATERMARK_NAME).first()
+
+    changed = VerificationSession.objects.filter(tenant_id__isnull=False, updated_at__lte=high)
+    if watermark is not None:
+        if watermark.value >= high:
+            return {"buckets": 0, "days": 0, "watermark": watermark.value}
+        changed = changed.filter(updated_at__gt=watermark.value)
+
+    by_day: Dict[datetime.date, set] = defaultdict(set)
+    buckets = changed.annotate(day=TruncDate("created_at")).values_list("tenant_id", "day").distinct().order_by()
+    for tenant_id, day in buckets:
+        by_day[day].add(tenant_id)
+
+    existing = TenantDailyRollup.objects.all()
+    if not full:
+        window_days = int(getattr(settings, "KYC_ROLLUP_REFRESH_DAYS", 3))
+        since = timezone.localdate(high) - datetime.timedelta(days=window_days - 1)
+        existing = existing.filter(day__gte=since) if window_days > 0 else existing.none()
+    for tenant_id, day in existing.values_list("tenant_id", "day"):
+        by_day[day].add(tenant_id)
+
+    refreshed = 0
+    for day in sorted(by_day):
+        refreshed += _write_day(day, sorted(by_day[day]))
+
+    RollupWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={"value": high})
+    logger.info("Refreshed %d tenant-day rollup(s) across %d day(s) up to %s", refreshed, len(by_day), high)
+    return {"buckets": refreshed, "days": len(by_day), "watermark": high}
+
+
+def _summary(day, totals: Dict[str, float]) -> Dict[str, object]:
+    sessions, checked = totals["sessions"], totals["checked"]
+
+    def rate(value, total):
+        return round(value / total, 4) if total else None
+
+    return {
+        "day": day,
+        "sessions": sessions,
+        "checked": checked,
+        "pass_rate": rate(totals["verified"], checked),
+        "liveness_rate": rate(totals["liveness_passed"], sessions),
+        "physical_rate": rate(totals["physical_passed"], sessions),
+        "avg_similarity": rate(totals["similarity_sum"], checked),
+        "approved": totals["approved"],
+        "rejected": totals["rejected"],
+    }
+
+
+def daily_summary(tenant=None, days: int = 14) -> List[Dict[str, object]]:
+    """Newest-first per-day rows for one tenant, or summed over all tenants."""
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    rows = TenantDailyRollup.objects.filter(day__gte=since)
+    if tenant is not None:
+        rows = rows.filter(tenant=tenant)
+    totals = rows.values("day").annotate(**{name: Sum(name) for name in _METRICS}).order_by("-day")
+    return [_summary(row.pop("day"), row) for row in totals]
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
-from deepface import DeepFace
+from .face_engine import get_face_engine
 
 
 @dataclass
@@ -28,16 +28,9 @@ class FaceVerificationService:
 
     def verify(self, id_face_path: str, selfie_path: str) -> Dict[str, Any]:
         results: List[Dict[str, Any]] = []
+        engine = get_face_engine()
 
-        for model in self.models:
-            r = DeepFace.verify(
-                img1_path=id_face_path,
-                img2_path=selfie_path,
-                model_name=model,
-                distance_metric="cosine",
-                enforce_detection=False,
-            )
-
+        for model, r in zip(self.models, engine.verify_models(id_face_path, selfie_path, self.models)):
             distance = float(r["distance"])
             similarity = (1.0 - distance) * 100.0
 
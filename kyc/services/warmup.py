@@ -0,0 +1,143 @@
+"""
+Per-process model warm-up.
+
+Importing TensorFlow, building the configured DeepFace models and running the
+first inference take tens of seconds. Doing it at worker boot, instead of in
+the first `/verify/submit/` request, keeps that request inside
+`GUNICORN_TIMEOUT`. `/healthz/` reports 503 until warm-up has finished (with
+the error while the last attempt failed), so the platform only routes traffic
+to workers that can actually verify. Background warm-up retries a failed
+attempt (e.g. a temporary weight-download error) with backoff from
+RETRY_INITIAL_SECONDS up to RETRY_MAX_SECONDS, so a worker recovers without
+a restart.
+
+With the inference sidecar, warm-up only waits for the sidecar to answer a
+ping, retrying with backoff for up to `KYC_INFERENCE_READY_TIMEOUT` seconds
+because the sidecar builds its models before it starts listening.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+import numpy as np
+from django.conf import settings
+
+from .face_engine import get_face_engine
+from .inference_sidecar import InferenceBusy
+
+logger = logging.getLogger(__name__)
+
+RETRY_INITIAL_SECONDS = 5.0
+RETRY_MAX_SECONDS = 300.0
+
+_STATE: Dict[str, Any] = {"status": "not_started"}
+_STATE_LOCK = threading.Lock()
+_THREAD = None
+
+
+def _set_state(**values):
+    with _STATE_LOCK:
+        _STATE.update(values)
+
+
+def warmup_status() -> Dict[str, Any]:
+    with _STATE_LOCK:
+        return dict(_STATE)
+
+
+def is_ready() -> bool:
+    """True unless warm-up was started and has not finished successfully."""
+    return warmup_status()["status"] not in {"pending", "running", "failed"}
+
+
+def wait_for_sidecar(engine, timeout: float = None) -> Dict[str, Any]:
+    """Ping the sidecar until it answers, backing off from 0.5s to 10s between attempts."""
+    if timeout is None:
+        timeout = float(getattr(settings, "KYC_INFERENCE_READY_TIMEOUT", 300.0))
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        try:
+            return engine.ping()
+        except (OSError, EOFError, InferenceBusy) as exc:
+            if time.monotonic() + delay > deadline:
+                raise
+            logger.info("Inference sidecar not ready (%s); retrying in %.1fs", exc, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, 10.0)
+
+
+def run_warmup(engine=None) -> Dict[str, Any]:
+    """Load the detector and every FACE_VERIFY_MODELS model and run one dummy inference each."""
+    started = time.perf_counter()
+    _set_state(status="running", error=None, models={})
+    model_names = list(getattr(settings, "FACE_VERIFY_MODELS", ["VGG-Face", "Facenet"]))
+    timings = {}
+    try:
+        engine = engine or get_face_engine()
+        if hasattr(engine, "ping"):
+            # Models live in the inference sidecar; only check that it answers.
+            step = time.perf_counter()
+            wait_for_sidecar(engine)
+            timings["sidecar"] = round(time.perf_counter() - step, 3)
+            model_names = []
+        else:
+            step = time.perf_counter()
+            engine.extract_faces(np.zeros((224, 224, 3), dtype=np.uint8))
+            timings["detector"] = round(time.perf_counter() - step, 3)
+
+        for model_name in model_names:
+            step = time.perf_counter()
+            height, width = engine.load_model(model_name).input_shape
+            engine.forward(np.zeros((1, height, width, 3), dtype=np.float32), model_name)
+            timings[model_name] = round(time.perf_counter() - step, 3)
+    except Exception as exc:
+        logger.exception("Model warm-up failed")
+        _set_state(
+            status="failed",
+            error=f"{type(exc).__name__}: {exc}"[:500],
+            models=timings,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        return warmup_status()
+
+    _set_state(status="ready", models=timings, elapsed_seconds=round(time.perf_counter() - started, 3))
+    logger.info("Model warm-up finished in %.1fs: %s", time.perf_counter() - started, timings)
+    return warmup_status()
+
+
+def _warmup_until_ready():
+    delay = RETRY_INITIAL_SECONDS
+    while run_warmup()["status"] == "failed":
+        logger.warning("Retrying model warm-up in %.0fs", delay)
+        time.sleep(delay)
+        delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+
+def start_warmup(mode: str = None) -> Dict[str, Any]:
+    """
+    Start warm-up once per process. `mode` (default `KYC_WARMUP`) is
+    `background` (thread; health check waits for it, failures are retried),
+    `blocking` or `off`.
+    """
+    global _THREAD
+    mode = (mode or getattr(settings, "KYC_WARMUP", "background") or "off").strip().lower()
+    if mode == "off":
+        _set_state(status="disabled")
+        return warmup_status()
+    if mode not in {"background", "blocking"}:
+        logger.warning("Unknown KYC_WARMUP mode %r; warming up in the background", mode)
+        mode = "background"
+
+    with _STATE_LOCK:
+        retrying = _THREAD is not None and _THREAD.is_alive()
+        if retrying or _STATE["status"] in {"pending", "running", "ready"}:
+            return dict(_STATE)
+        _STATE.update(status="pending")
+
+    if mode == "blocking":
+        return run_warmup()
+    _THREAD = threading.Thread(target=_warmup_until_ready, daemon=True, name="kyc-model-warmup")
+    _THREAD.start()
+    return warmup_status()
@@ -22,6 +22,7 @@ urlpatterns = [
     path('session/submit', api_views.submit_session, name='submit_session'),
     path('liveness-result', api_views.save_liveness_result, name='liveness_result'),
     path('capture/', api_views.capture_image, name='capture_image'),
+    path('capture/upload/', api_views.capture_upload, name='capture_upload'),
 
     # Document capture (legacy UI endpoint)
     path('capture-document/', views.capture_document, name='capture_document'),
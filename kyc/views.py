@@ -1,12 +1,13 @@
 import logging
 from smtplib import SMTPException
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
 from django.http import JsonResponse, HttpResponseForbidden
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.mail import send_mail
-from django.db import transaction
+from django.db import close_old_connections, transaction
 import json
 import os
 import cv2
@@ -15,7 +16,8 @@ import base64
 from datetime import datetime, timezone
 import subprocess
 import time
-from .models import VerificationSession, Tenant, Customer, VerificationLink
+from concurrent.futures import ThreadPoolExecutor
+from .models import VerificationSession, VerificationJob, Tenant, Customer, VerificationLink
 from accounts.models import User
 from django.utils import timezone as dj_timezone
 from django.utils.text import slugify
@@ -23,12 +25,23 @@ from django.utils.crypto import get_random_string
 from urllib.parse import urlencode
 
 from .forms import TenantCreateForm, TenantUpdateForm
+from .services import counters, ocr_cache, rollups
 from .services.card_physical_check import analyze_card_physicality
+from .services.embedding_cache import get_embedding_cache
+from .services.face_engine import DetectedFaces, get_face_engine
+from .services.inference_sidecar import InferenceBusy, RemoteFaceEngine, shrink_for_transport
 from .services.mistral_ai import build_identity_assist, enqueue_session_ocr
+from .services.pagination import InvalidCursor, keyset_paginate
+from .services.quality_gate import capture_quality
 
 # Global variable to track liveness process
 liveness_process = None
 logger = logging.getLogger(__name__)
+_AUDIT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kyc-audit-writer")
+_VERIFY_POOL = ThreadPoolExecutor(
+    max_workers=max(1, int(getattr(settings, "KYC_VERIFY_WORKERS", 1))),
+    thread_name_prefix="kyc-verify",
+)
 
 
 def _generate_temp_password(length=12):
@@ -76,15 +89,87 @@ def _require_user_type(user, allowed_types):
     return user.role in allowed_types
 
 
+# Listing querysets; each matches one of the kyc_sessions composite indexes
+# (see VerificationSession.Meta.indexes).
+_SESSION_ORDERING = ("-created_at", "-id")
+_USER_ORDERING = ("email",)  # unique, so it is a complete keyset on its own
+_TENANT_ORDERING = ("name", "id")
+
+
+# List pages only render these columns. `only()` keeps document_data (full OCR
+# output), tilt_analysis, liveness_challenges and user_agent out of the SELECT;
+# templates must not touch any other field or each row costs an extra query.
+_SESSION_LIST_FIELDS = (
+    "id",
+    "tenant_id",
+    "customer_id",
+    "created_at",
+    "status",
+    "review_status",
+    "document_type",
+    "detected_card_type",
+    "liveness_verified",
+    "verify_verified",
+)
+_CUSTOMER_LIST_FIELDS = ("customer__id", "customer__full_name", "customer__email", "customer__citizenship_type")
+
+
+def _pending_review_queryset():
+    return (
+        VerificationSession.objects.select_related("tenant", "customer")
+        .only(*_SESSION_LIST_FIELDS, *_CUSTOMER_LIST_FIELDS, "tenant__slug")
+        .filter(review_status="pending")
+        .order_by(*_SESSION_ORDERING)
+    )
+
+
+def _tenant_sessions_queryset(tenant):
+    return (
+        VerificationSession.objects.select_related("customer")
+        .only(*_SESSION_LIST_FIELDS, *_CUSTOMER_LIST_FIELDS)
+        .filter(tenant=tenant)
+        .order_by(*_SESSION_ORDERING)
+    )
+
+
+def _review_queryset(tenant_slug=None, status=None, review_status=None):
+    qs = (
+        VerificationSession.objects.select_related("customer")
+        .only(*_SESSION_LIST_FIELDS, *_CUSTOMER_LIST_FIELDS)
+        .order_by(*_SESSION_ORDERING)
+    )
+    if tenant_slug:
+        qs = qs.filter(tenant__slug=tenant_slug)
+    if status:
+        qs = qs.filter(status=status)
+    if review_status:
+        qs = qs.filter(review_status=review_status)
+    return qs
+
+
+def _paginate(request, queryset, ordering, scope):
+    """Keyset page for `?cursor=`; a stale or tampered cursor restarts at the first page."""
+    page_size = int(getattr(settings, "KYC_LIST_PAGE_SIZE", 50))
+    try:
+        page = keyset_paginate(queryset, ordering, page_size, cursor=request.GET.get("cursor"), scope=scope)
+    except InvalidCursor:
+        page = keyset_paginate(queryset, ordering, page_size, scope=scope)
+
+    links = {"next_url": None, "previous_url": None}
+    for key, cursor in (("next_url", page.next_cursor), ("previous_url", page.previous_cursor)):
+        if cursor:
+            params = request.GET.copy()
+            params["cursor"] = cursor
+            links[key] = f"?{params.urlencode()}"
+    return page, links
+
+
 @login_required
 def platform_dashboard(request):
     if not _require_user_type(request.user, {"super_admin"}):
         return _role_denied()
 
-    tenants = Tenant.objects.all().order_by("name")
-    pending_sessions = VerificationSession.objects.select_related("tenant", "customer").filter(
-        review_status="pending"
-    ).order_by("-created_at")[:50]
+    pending_sessions = _pending_review_queryset()[:50]
     users = User.objects.select_related("tenant").order_by("email")[:200]
     create_form = TenantCreateForm()
     create_error = None
@@ -125,6 +210,8 @@ def platform_dashboard(request):
                             company_id=tenant.slug,
                             is_active=is_active,
                         )
+                        counters.bump("tenants")
+                        counters.bump("users", tenant=tenant)
                         subject, message = _build_tenant_welcome_email(
                             tenant=tenant,
                             recipient_email=owner_email,
@@ -147,12 +234,16 @@ def platform_dashboard(request):
         else:
             create_error = "Please correct the form errors."
 
+    tenant_page, tenant_links = _paginate(request, Tenant.objects.all(), _TENANT_ORDERING, "tenants")
+    stats = counters.read_counters()
     context = {
-        "tenants": tenants,
-        "tenant_count": Tenant.objects.filter(deleted_at__isnull=True).count(),
-        "user_count": User.objects.count(),
-        "session_count": VerificationSession.objects.count(),
-        "pending_reviews": VerificationSession.objects.filter(review_status="pending").count(),
+        "daily_stats": rollups.daily_summary(days=14),
+        "tenants": tenant_page.items,
+        **tenant_links,
+        "tenant_count": stats["tenants"],
+        "user_count": stats["users"],
+        "session_count": stats["sessions"],
+        "pending_reviews": stats["pending_reviews"],
         "pending_sessions": pending_sessions,
         "users": users,
         "create_form": create_form,
@@ -172,11 +263,14 @@ def admin_tenant_detail(request, tenant_id):
         return _role_denied()
     tenant = get_object_or_404(Tenant, uuid=tenant_id)
     users = User.objects.filter(tenant=tenant).order_by("email")
-    sessions = VerificationSession.objects.filter(tenant=tenant).order_by("-created_at")[:100]
+    page, links = _paginate(request, _tenant_sessions_queryset(tenant), _SESSION_ORDERING, f"tenant:{tenant.uuid}")
     context = {
         "tenant": tenant,
         "users": users,
-        "sessions": sessions,
+        "sessions": page.items,
+        "stats": counters.read_counters(tenant),
+        "daily_stats": rollups.daily_summary(tenant, days=30),
+        **links,
     }
     return render(request, "kyc/admin_tenant_detail.html", context)
 
@@ -250,6 +344,8 @@ def admin_tenant_delete(request, tenant_id):
         return redirect("platform_dashboard")
 
     tenant = get_object_or_404(Tenant, uuid=tenant_id)
+    if tenant.deleted_at is None:
+        counters.bump("tenants", -1)
     tenant.is_active = False
     tenant.deleted_at = dj_timezone.now()
     tenant.deleted_by = request.user
@@ -258,6 +354,7 @@ def admin_tenant_delete(request, tenant_id):
     if not tenant.suspended_reason:
         tenant.suspended_reason = "Soft deleted"
     tenant.save(update_fields=["is_active", "deleted_at", "deleted_by", "suspended_at", "suspended_reason"])
+    ocr_cache.purge_tenant(tenant.pk)
     return redirect("platform_dashboard")
 
 
@@ -265,9 +362,9 @@ def admin_tenant_delete(request, tenant_id):
 def admin_users(request):
     if not _require_user_type(request.user, {"super_admin"}):
         return _role_denied()
-    users = User.objects.select_related("tenant").order_by("email")
+    page, links = _paginate(request, User.objects.select_related("tenant"), _USER_ORDERING, "users")
     reset_notice = request.session.pop("reset_password_notice", None)
-    return render(request, "kyc/admin_users.html", {"users": users, "reset_notice": reset_notice})
+    return render(request, "kyc/admin_users.html", {"users": page.items, "reset_notice": reset_notice, **links})
 
 
 @login_required
@@ -403,18 +500,12 @@ def review_sessions(request):
     if not _require_user_type(request.user, {"super_admin"}):
         return _role_denied()
 
-    qs = VerificationSession.objects.select_related("tenant", "reviewed_by", "customer").order_by("-created_at")
-
-    if tenant_slug:
-        qs = qs.filter(tenant__slug=tenant_slug)
-
-    if status:
-        qs = qs.filter(status=status)
-    if review_status:
-        qs = qs.filter(review_status=review_status)
+    qs = _review_queryset(tenant_slug=tenant_slug, status=status, review_status=review_status)
+    page, links = _paginate(request, qs, _SESSION_ORDERING, "review_sessions")
 
     context = {
-        "sessions": qs[:200],
+        "sessions": page.items,
+        **links,
         "tenant_slug": tenant_slug or "",
         "status": status or "",
         "review_status": review_status or "",
@@ -432,11 +523,27 @@ def review_session_detail(request, session_id):
         return _role_denied()
 
     if request.method == "POST":
-        session.review_status = request.POST.get("review_status", session.review_status)
-        session.review_notes = request.POST.get("review_notes", session.review_notes)
-        session.reviewed_by = request.user
-        session.reviewed_at = datetime.now(timezone.utc)
-        session.save(update_fields=["review_status", "review_notes", "reviewed_by", "reviewed_at"])
+        review_status = request.POST.get("review_status", session.review_status)
+        reviewed_at = datetime.now(timezone.utc)
+        fields = {
+            "review_status": review_status,
+            "review_notes": request.POST.get("review_notes", session.review_notes),
+            "reviewed_by": request.user,
+            "reviewed_at": reviewed_at,
+            "updated_at": reviewed_at,
+        }
+        # Compare-and-set on the status we read, so two reviewers moving the same
+        # session out of "pending" only decrement the pending counter once.
+        previous_review_status = session.review_status
+        while not VerificationSession.objects.filter(pk=session.pk, review_status=previous_review_status).update(
+            **fields
+        ):
+            previous_review_status = (
+                VerificationSession.objects.filter(pk=session.pk).values_list("review_status", flat=True).first()
+            )
+            if previous_review_status is None:
+                return redirect("review_sessions")
+        counters.record_review_change(session.tenant_id, previous_review_status, review_status)
         return redirect("review_session_detail", session_id=session.id)
 
     context = {
@@ -620,12 +727,19 @@ def capture_document(request):
             nparr = np.frombuffer(image_bytes, np.uint8)
             img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
-            # Basic quality checks
-            quality_check = check_image_quality(img)
-            if not quality_check['passed']:
+            if img is None:
                 return JsonResponse({
                     'success': False,
-                    'error': quality_check['message']
+                    'error': 'Invalid image data'
+                }, status=400)
+
+            # Same gate (and KYC_CAPTURE_QUALITY_GATE mode) as the capture API.
+            quality_check = capture_quality(img, doc_type)
+            if quality_check['enforced'] and not quality_check['passed']:
+                return JsonResponse({
+                    'success': False,
+                    'error': quality_check['message'],
+                    'quality': quality_check
                 }, status=400)
 
             # Save image
@@ -663,116 +777,221 @@ def verify_kyc(request):
 
     try:
         data = json.loads(request.body)
-        session_id = data.get("session_id")
-        tenant = _resolve_tenant(data)
-        front_path = data.get("front_image")
-        back_path = data.get("back_image")
-        selfie_path = data.get("selfie_image")
-        tilt_images = data.get("tilt_images") or []
-        liveness_verified = bool(data.get("liveness_verified", False))
-
-        if session_id and tenant is None:
-            return JsonResponse({"success": False, "error": "Missing or invalid tenant"}, status=400)
-        if not front_path or not selfie_path:
-            return JsonResponse({"success": False, "error": "Missing required images (front and selfie)"}, status=400)
-
-        front_path = _resolve_media_path(front_path)
-        back_path = _resolve_media_path(back_path)
-        selfie_path = _resolve_media_path(selfie_path)
-        tilt_paths = [_resolve_media_path(path) for path in tilt_images if path]
-
-        card_detection = None
-        session_for_identity = None
-        if session_id and tenant is not None:
-            session_for_identity = VerificationSession.objects.select_related("customer").filter(
-                id=session_id, tenant=tenant
-            ).first()
-            card_detection, tilt_paths = _hydrate_card_context(session_for_identity, tilt_images, tilt_paths)
-            # Keep back OCR available even if frontend payload misses back_image.
-            if not back_path and session_for_identity is not None:
-                back_path = _resolve_media_path(
-                    session_for_identity.document_back_url or session_for_identity.back_image
-                )
-
-        if not os.path.exists(front_path):
-            return JsonResponse({"success": False, "error": f"Front image not found: {front_path}"}, status=400)
-        if not os.path.exists(selfie_path):
-            return JsonResponse({"success": False, "error": f"Selfie image not found: {selfie_path}"}, status=400)
-
-        id_face_path = _extract_id_face_crop(front_path)
-        if not id_face_path:
-            return JsonResponse(
-                {"success": False, "error": "No face found in ID card. Please ensure the photo on the ID is clear and visible."},
-                status=400,
-            )
+        run_async = data.get("async")
+        if run_async is None:
+            # The project-wide default only applies to session-bound calls;
+            # legacy callers without a session_id keep the synchronous API.
+            run_async = getattr(settings, "KYC_VERIFY_ASYNC", False) and bool(data.get("session_id"))
+        if _truthy(run_async):
+            return _accept_verification_job(data)
+
+        payload, status = _run_verification(data)
+        return JsonResponse(payload, status=status)
+
+    except InferenceBusy as exc:
+        response = JsonResponse({"success": False, "error": str(exc), "retryable": True}, status=503)
+        response["Retry-After"] = "2"
+        return response
+    except Exception as exc:
+        logger.exception("verify_kyc failed")
+        return JsonResponse({"success": False, "error": str(exc)}, status=500)
 
-        verification = _compare_id_vs_selfie(id_face_path=id_face_path, selfie_path=selfie_path)
-        if not verification["ok"]:
-            return JsonResponse({"success": False, "error": verification["error"]}, status=500)
 
-        identity_assist = build_identity_assist(
-            face_similarity=verification["avg_similarity"],
-            liveness_verified=liveness_verified,
-            customer=(session_for_identity.customer if session_for_identity else None),
-            ocr_result={},
-        )
+def _truthy(value):
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
 
-        ai_document_extraction = {
-            "status": "queued" if getattr(settings, "MISTRAL_ENABLE_OCR", True) else "disabled",
-            "front": None,
-            "back": None,
-        }
-        physical_result = analyze_card_physicality(tilt_paths)
 
-        result_payload = {
+def _accept_verification_job(data):
+    session_id = data.get("session_id")
+    tenant = _resolve_tenant(data)
+    if not session_id:
+        return JsonResponse({"success": False, "error": "Async verification requires session_id"}, status=400)
+    if tenant is None:
+        return JsonResponse({"success": False, "error": "Missing or invalid tenant"}, status=400)
+    if not data.get("front_image") or not data.get("selfie_image"):
+        return JsonResponse({"success": False, "error": "Missing required images (front and selfie)"}, status=400)
+
+    session = VerificationSession.objects.filter(id=session_id, tenant=tenant).first()
+    if session is None:
+        return JsonResponse({"success": False, "error": "Session not found"}, status=404)
+
+    payload = {key: value for key, value in data.items() if key != "async"}
+    job = VerificationJob.objects.create(session=session, payload=payload)
+    transaction.on_commit(lambda: _submit_verification_job(job.id))
+
+    status_url = f"{reverse('session_status', args=[session.id])}?{urlencode({'tenant_slug': tenant.slug})}"
+    return JsonResponse(
+        {
             "success": True,
-            "verified": verification["final_match"],
-            "similarity": verification["avg_similarity"],
-            "confidence": verification["avg_similarity"],
-            "votes": verification["votes_yes"],
-            "total_models": len(verification["results"]),
-            "liveness_verified": liveness_verified,
-            "details": {
-                "id_face_path": id_face_path,
-                "models": verification["results"],
-                "liveness_status": "verified" if liveness_verified else "skipped",
-                "tilt_frames_used": physical_result.get("frames_used", 0),
-            },
-            "ai_document_extraction": ai_document_extraction,
-            "identity_assist": identity_assist,
-            "physical_card_check": physical_result,
-        }
-        if card_detection:
-            result_payload["detected_card"] = card_detection
+            "queued": True,
+            "job_id": job.id,
+            "session_id": str(session.id),
+            "status": job.status,
+            "status_url": status_url,
+        },
+        status=202,
+    )
 
-        if session_id:
-            _update_session_verification(
+
+def _submit_verification_job(job_id):
+    # With dedicated `run_verification_jobs` processes the row stays queued for them.
+    if getattr(settings, "KYC_VERIFY_EMBEDDED_WORKER", True):
+        _VERIFY_POOL.submit(_run_verification_job, job_id)
+
+
+def _run_verification_job(job_id):
+    """Worker-pool entry point; claims a queued job so each one runs once."""
+    try:
+        claimed = VerificationJob.objects.filter(id=job_id, status="queued").update(
+            status="running",
+            stage="starting",
+            progress=5,
+            started_at=dj_timezone.now(),
+        )
+        if not claimed:
+            return
+        job = VerificationJob.objects.get(id=job_id)
+
+        def _progress(stage, percent):
+            VerificationJob.objects.filter(id=job_id).update(stage=stage, progress=percent)
+
+        try:
+            payload, status = _run_verification(job.payload, progress=_progress)
+        except InferenceBusy as exc:
+            payload, status = {"success": False, "error": str(exc), "retryable": True}, 503
+        except Exception as exc:
+            logger.exception("Verification job %s failed", job_id)
+            payload, status = {"success": False, "error": str(exc)}, 500
+
+        VerificationJob.objects.filter(id=job_id, status="running").update(
+            status="completed" if status < 400 else "failed",
+            stage="done",
+            progress=100,
+            result=payload,
+            error=None if status < 400 else payload.get("error"),
+            finished_at=dj_timezone.now(),
+        )
+    finally:
+        close_old_connections()
+
+
+def _run_verification(data, progress=None):
+    """Run the full verification pipeline; returns (response payload, HTTP status)."""
+    progress = progress or (lambda stage, percent: None)
+    session_id = data.get("session_id")
+    tenant = _resolve_tenant(data)
+    front_path = data.get("front_image")
+    back_path = data.get("back_image")
+    selfie_path = data.get("selfie_image")
+    tilt_images = data.get("tilt_images") or []
+    liveness_verified = bool(data.get("liveness_verified", False))
+
+    if session_id and tenant is None:
+        return {"success": False, "error": "Missing or invalid tenant"}, 400
+    if not front_path or not selfie_path:
+        return {"success": False, "error": "Missing required images (front and selfie)"}, 400
+
+    front_path = _resolve_media_path(front_path)
+    back_path = _resolve_media_path(back_path)
+    selfie_path = _resolve_media_path(selfie_path)
+    tilt_paths = [_resolve_media_path(path) for path in tilt_images if path]
+
+    card_detection = None
+    session_for_identity = None
+    if session_id and tenant is not None:
+        session_for_identity = VerificationSession.objects.select_related("customer").filter(
+            id=session_id, tenant=tenant
+        ).first()
+        card_detection, tilt_paths = _hydrate_card_context(session_for_identity, tilt_images, tilt_paths)
+        # Keep back OCR available even if frontend payload misses back_image.
+        if not back_path and session_for_identity is not None:
+            back_path = _resolve_media_path(
+                session_for_identity.document_back_url or session_for_identity.back_image
+            )
+
+    if not os.path.exists(front_path):
+        return {"success": False, "error": f"Front image not found: {front_path}"}, 400
+    if not os.path.exists(selfie_path):
+        return {"success": False, "error": f"Selfie image not found: {selfie_path}"}, 400
+
+    progress("face_detection", 15)
+    id_face = _extract_id_face(front_path)
+    if not id_face:
+        return {"success": False, "error": "No face found in ID card. Please ensure the photo on the ID is clear and visible."}, 400
+    id_face_path = _save_id_face_artifact(id_face["crop"])
+
+    progress("face_match", 35)
+    verification = _compare_id_vs_selfie(id_face=id_face["face"], selfie_path=selfie_path)
+    if not verification["ok"]:
+        return {"success": False, "error": verification["error"]}, 500
+
+    identity_assist = build_identity_assist(
+        face_similarity=verification["avg_similarity"],
+        liveness_verified=liveness_verified,
+        customer=(session_for_identity.customer if session_for_identity else None),
+        ocr_result={},
+    )
+
+    ai_document_extraction = {
+        "status": "queued" if getattr(settings, "MISTRAL_ENABLE_OCR", True) else "disabled",
+        "front": None,
+        "back": None,
+    }
+    logger.info("Embedding cache after verification: %s", get_embedding_cache().stats())
+    progress("card_physicality", 70)
+    physical_result = analyze_card_physicality(
+        tilt_paths,
+        precomputed=(session_for_identity.tilt_frame_metrics if session_for_identity else None),
+    )
+
+    result_payload = {
+        "success": True,
+        "verified": verification["final_match"],
+        "similarity": verification["avg_similarity"],
+        "confidence": verification["avg_similarity"],
+        "votes": verification["votes_yes"],
+        "total_models": len(verification["results"]),
+        "liveness_verified": liveness_verified,
+        "details": {
+            "id_face_path": id_face_path,
+            "models": verification["results"],
+            "liveness_status": "verified" if liveness_verified else "skipped",
+            "tilt_frames_used": physical_result.get("frames_used", 0),
+        },
+        "ai_document_extraction": ai_document_extraction,
+        "identity_assist": identity_assist,
+        "physical_card_check": physical_result,
+    }
+    if card_detection:
+        result_payload["detected_card"] = card_detection
+
+    if session_id:
+        progress("saving", 90)
+        _update_session_verification(
+            session_id=session_id,
+            tenant=tenant,
+            verified=verification["final_match"],
+            confidence=verification["avg_similarity"],
+            similarity=verification["avg_similarity"],
+            liveness_verified=liveness_verified,
+            physical_result=physical_result,
+            card_detection=card_detection,
+            ai_document_extraction=ai_document_extraction,
+            identity_assist=identity_assist,
+        )
+        if getattr(settings, "MISTRAL_ENABLE_OCR", True):
+            enqueue_session_ocr(
                 session_id=session_id,
-                tenant=tenant,
-                verified=verification["final_match"],
-                confidence=verification["avg_similarity"],
-                similarity=verification["avg_similarity"],
-                liveness_verified=liveness_verified,
-                physical_result=physical_result,
-                card_detection=card_detection,
-                ai_document_extraction=ai_document_extraction,
-                identity_assist=identity_assist,
+                tenant_id=tenant.id if tenant else None,
+                front_path=front_path,
+                back_path=back_path if back_path and os.path.exists(back_path) else None,
+                document_type=(session_for_identity.document_type if session_for_identity else None),
+                enable_back_ocr=getattr(settings, "MISTRAL_ENABLE_BACK_OCR", False),
             )
-            if getattr(settings, "MISTRAL_ENABLE_OCR", True):
-                enqueue_session_ocr(
-                    session_id=session_id,
-                    tenant_id=tenant.id if tenant else None,
-                    front_path=front_path,
-                    back_path=back_path if back_path and os.path.exists(back_path) else None,
-                    document_type=(session_for_identity.document_type if session_for_identity else None),
-                    enable_back_ocr=getattr(settings, "MISTRAL_ENABLE_BACK_OCR", False),
-                )
-
-        return JsonResponse(result_payload)
 
-    except Exception as exc:
-        logger.exception("verify_kyc failed")
-        return JsonResponse({"success": False, "error": str(exc)}, status=500)
+    return result_payload, 200
 
 
 def _hydrate_card_context(session, tilt_images, tilt_paths):
@@ -808,25 +1027,35 @@ def _hydrate_card_context(session, tilt_images, tilt_paths):
     return card_detection, tilt_paths
 
 
-def _extract_id_face_crop(front_path):
-    from deepface import DeepFace
-
-    faces = DeepFace.extract_faces(
-        img_path=front_path,
-        detector_backend="opencv",
-        enforce_detection=False,
-        align=True,
-    )
-    if not faces:
-        return None
+def _extract_id_face(front_path):
+    """
+    Decode the ID front once and detect the portrait in memory.
 
-    largest_face = max(faces, key=lambda x: x["facial_area"]["w"] * x["facial_area"]["h"])
+    Returns the decoded image, the padded face box, the padded BGR crop and the
+    aligned face handed straight to the verifier, or None when nothing usable is found.
+    With the inference sidecar, a downscaled copy is sent over the socket and the
+    box is mapped back to full-resolution coordinates.
+    """
     doc_image = cv2.imread(front_path)
     if doc_image is None:
         return None
 
-    facial_area = largest_face["facial_area"]
-    x, y, w, h = facial_area["x"], facial_area["y"], facial_area["w"], facial_area["h"]
+    engine = get_face_engine()
+    scale = 1.0
+    sent_image = doc_image
+    if isinstance(engine, RemoteFaceEngine):
+        sent_image, scale = shrink_for_transport(doc_image)
+
+    detected = engine.extract_faces(sent_image)
+    if not detected.faces:
+        return None
+
+    largest = max(
+        range(len(detected.faces)),
+        key=lambda i: detected.facial_areas[i].get("w", 0) * detected.facial_areas[i].get("h", 0),
+    )
+    facial_area = detected.facial_areas[largest]
+    x, y, w, h = (int(round(facial_area.get(key, 0) / scale)) for key in ("x", "y", "w", "h"))
 
     padding = 20
     x = max(0, x - padding)
@@ -834,32 +1063,43 @@ def _extract_id_face_crop(front_path):
     w = min(doc_image.shape[1] - x, w + 2 * padding)
     h = min(doc_image.shape[0] - y, h + 2 * padding)
 
-    id_face = doc_image[y:y + h, x:x + w]
+    return {
+        "image": doc_image,
+        "box": (x, y, w, h),
+        "crop": doc_image[y:y + h, x:x + w],
+        "face": DetectedFaces(faces=[detected.faces[largest]], facial_areas=[facial_area]),
+    }
+
+
+def _write_id_face_artifact(id_face_path, crop):
+    try:
+        cv2.imwrite(id_face_path, crop, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    except Exception:
+        logger.exception("Failed to write ID face audit crop %s", id_face_path)
+
+
+def _save_id_face_artifact(crop):
+    """Queue the padded ID crop for an off-request audit write; returns the target path."""
+    if not getattr(settings, "KYC_SAVE_ID_FACE_CROPS", True):
+        return None
     extracted_faces_dir = os.path.join(settings.MEDIA_ROOT, "extracted_faces")
     os.makedirs(extracted_faces_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     id_face_path = os.path.join(extracted_faces_dir, f"id_face_{timestamp}.jpg")
-    cv2.imwrite(id_face_path, id_face, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    _AUDIT_WRITER.submit(_write_id_face_artifact, id_face_path, crop.copy())
     return id_face_path
 
 
-def _compare_id_vs_selfie(id_face_path, selfie_path):
-    from deepface import DeepFace
-
-    models = ["VGG-Face", "Facenet"]
+def _compare_id_vs_selfie(id_face, selfie_path):
+    engine = get_face_engine()
+    models = list(getattr(settings, "FACE_VERIFY_MODELS", ["VGG-Face", "Facenet"]))
     results = []
-    for model in models:
-        result = DeepFace.verify(
-            img1_path=id_face_path,
-            img2_path=selfie_path,
-            model_name=model,
-            enforce_detection=False,
-        )
+    for result in engine.verify_models(id_face, selfie_path, models):
         distance = float(result["distance"])
         similarity = (1 - distance) * 100
         results.append(
             {
-                "model": model,
+                "model": result["model"],
                 "similarity": similarity,
                 "verified": bool(result["verified"]),
                 "distance": distance,
@@ -977,40 +1217,3 @@ def _resolve_tenant(data):
         return Tenant.objects.get(slug=tenant_slug)
     except Tenant.DoesNotExist:
         return None
-
-
-def check_image_quality(img):
-    """Check if image quality is acceptable"""
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    brightness = np.mean(gray)
-
-    if brightness < 40:
-        return {
-            'passed': False,
-            'message': 'Image too dark. Please ensure good lighting.',
-            'brightness': float(brightness)
-        }
-
-    if brightness > 220:
-        return {
-            'passed': False,
-            'message': 'Image too bright. Reduce lighting or avoid glare.',
-            'brightness': float(brightness)
-        }
-
-    # Check for blur
-    laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-
-    if laplacian_var < 50:  # Lowered threshold for mobile cameras
-        return {
-            'passed': False,
-            'message': 'Image is blurry. Please hold steady and focus.',
-            'sharpness': float(laplacian_var)
-        }
-
-    return {
-        'passed': True,
-        'message': 'Image quality is good',
-        'brightness': float(brightness),
-        'sharpness': float(laplacian_var)
-    }
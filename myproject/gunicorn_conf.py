@@ -0,0 +1,50 @@
+"""
+Gunicorn configuration (`gunicorn -c myproject/gunicorn_conf.py myproject.wsgi:application`).
+
+With `GUNICORN_PRELOAD=true` the Django app is imported once in the master and
+the workers are forked from it, sharing those pages copy-on-write.
+`gc.freeze()` moves everything loaded so far into the permanent generation;
+otherwise the first collection in each worker would touch (and so copy) every
+object header.
+
+That only shares Python modules. Model memory is not shared this way:
+TensorFlow is not fork-safe, so the master never builds the face models and
+each worker warms up after fork. Sharing one copy of the weights between
+workers is done by the inference sidecar (`KYC_INFERENCE_BACKEND=sidecar`),
+which holds the models in a single separate process.
+"""
+import gc
+import os
+
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+accesslog = "-"
+errorlog = "-"
+
+preload_app = _env_bool("GUNICORN_PRELOAD", default=False)
+
+
+def when_ready(server):
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from kyc.services.mistral_ai import ensure_ocr_worker_started
+    from kyc.services.warmup import start_warmup
+
+    # wsgi.py skipped these in the master; start them in each forked worker.
+    start_warmup(mode="background")
+    ensure_ocr_worker_started()
@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 from urllib.parse import unquote, urlsplit
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -302,3 +303,56 @@ MISTRAL_RETRY_BASE_SECONDS = env_float("MISTRAL_RETRY_BASE_SECONDS", default=1.0
 MISTRAL_MIN_INTERVAL_SECONDS = env_float("MISTRAL_MIN_INTERVAL_SECONDS", default=1.0)
 MISTRAL_QUEUE_MAX_ATTEMPTS = int(os.getenv("MISTRAL_QUEUE_MAX_ATTEMPTS", "6"))
 MISTRAL_QUEUE_RETRY_BASE_SECONDS = env_float("MISTRAL_QUEUE_RETRY_BASE_SECONDS", default=30.0)
+
+FACE_VERIFY_MODELS = env_list("FACE_VERIFY_MODELS", default=["VGG-Face", "Facenet"])
+FACE_DETECTOR_BACKEND = os.getenv("FACE_DETECTOR_BACKEND", "opencv").strip() or "opencv"
+FACE_EMBEDDING_CACHE_SIZE = int(os.getenv("FACE_EMBEDDING_CACHE_SIZE", "256"))
+FACE_EMBEDDING_CACHE_DISK = env_bool("FACE_EMBEDDING_CACHE_DISK", default=False)
+FACE_EMBEDDING_CACHE_DISK_TTL_SECONDS = env_float("FACE_EMBEDDING_CACHE_DISK_TTL_SECONDS", default=24 * 3600.0)
+KYC_SAVE_ID_FACE_CROPS = env_bool("KYC_SAVE_ID_FACE_CROPS", default=True)
+KYC_VERIFY_ASYNC = env_bool("KYC_VERIFY_ASYNC", default=False)
+KYC_VERIFY_WORKERS = int(os.getenv("KYC_VERIFY_WORKERS", "1"))
+KYC_VERIFY_EMBEDDED_WORKER = env_bool("KYC_VERIFY_EMBEDDED_WORKER", default=True)
+KYC_VERIFY_STALE_MINUTES = int(os.getenv("KYC_VERIFY_STALE_MINUTES", "15"))
+MISTRAL_OCR_EMBEDDED_WORKER = env_bool("MISTRAL_OCR_EMBEDDED_WORKER", default=True)
+MISTRAL_OCR_POLL_SECONDS = env_float("MISTRAL_OCR_POLL_SECONDS", default=2.0)
+MISTRAL_OCR_VISIBILITY_TIMEOUT_SECONDS = env_float("MISTRAL_OCR_VISIBILITY_TIMEOUT_SECONDS", default=300.0)
+MISTRAL_RATE_LIMIT_PER_SECOND = env_float(
+    "MISTRAL_RATE_LIMIT_PER_SECOND",
+    default=(1.0 / MISTRAL_MIN_INTERVAL_SECONDS) if MISTRAL_MIN_INTERVAL_SECONDS > 0 else 0.0,
+)
+MISTRAL_RATE_LIMIT_BURST = env_float("MISTRAL_RATE_LIMIT_BURST", default=2.0)
+MISTRAL_RATE_LIMIT_STATE_FILE = os.getenv(
+    "MISTRAL_RATE_LIMIT_STATE_FILE",
+    os.path.join(tempfile.gettempdir(), "moonkyc-mistral-ratelimit.json"),
+)
+MISTRAL_HTTP_POOL_SIZE = int(os.getenv("MISTRAL_HTTP_POOL_SIZE", "4"))
+MISTRAL_OCR_MAX_EDGE = int(os.getenv("MISTRAL_OCR_MAX_EDGE", "1600"))
+MISTRAL_OCR_JPEG_QUALITY = int(os.getenv("MISTRAL_OCR_JPEG_QUALITY", "85"))
+MISTRAL_OCR_CROP_TO_CARD = env_bool("MISTRAL_OCR_CROP_TO_CARD", default=False)
+MISTRAL_OCR_CACHE_TTL_SECONDS = env_float("MISTRAL_OCR_CACHE_TTL_SECONDS", default=7 * 24 * 3600.0)
+KYC_CAPTURE_MAX_BYTES = int(os.getenv("KYC_CAPTURE_MAX_BYTES", str(15 * 1024 * 1024)))
+# off | report (metrics returned and logged, nothing rejected) | enforce
+KYC_CAPTURE_QUALITY_GATE = os.getenv("KYC_CAPTURE_QUALITY_GATE", "report").strip().lower() or "report"
+KYC_PHYSICAL_CHECK_WORKERS = int(os.getenv("KYC_PHYSICAL_CHECK_WORKERS", "4"))
+KYC_PHYSICAL_CHECK_PYRAMID_LEVEL = int(os.getenv("KYC_PHYSICAL_CHECK_PYRAMID_LEVEL", "0"))
+KYC_PHYSICAL_CHECK_EARLY_EXIT_FRAMES = int(os.getenv("KYC_PHYSICAL_CHECK_EARLY_EXIT_FRAMES", "0"))
+KYC_WARMUP = os.getenv("KYC_WARMUP", "background").strip().lower() or "background"
+KYC_INFERENCE_BACKEND = os.getenv("KYC_INFERENCE_BACKEND", "local").strip().lower() or "local"
+KYC_INFERENCE_SOCKET = os.getenv("KYC_INFERENCE_SOCKET", os.path.join(tempfile.gettempdir(), "moonkyc-inference.sock"))
+KYC_INFERENCE_AUTHKEY = os.getenv("KYC_INFERENCE_AUTHKEY", "")
+KYC_INFERENCE_TIMEOUT = env_float("KYC_INFERENCE_TIMEOUT", default=60.0)
+KYC_INFERENCE_READY_TIMEOUT = env_float("KYC_INFERENCE_READY_TIMEOUT", default=300.0)
+KYC_INFERENCE_MAX_IMAGE_EDGE = int(os.getenv("KYC_INFERENCE_MAX_IMAGE_EDGE", "1280"))
+KYC_INFERENCE_QUEUE_SIZE = int(os.getenv("KYC_INFERENCE_QUEUE_SIZE", "16"))
+KYC_INFERENCE_MAX_BATCH = int(os.getenv("KYC_INFERENCE_MAX_BATCH", "32"))
+KYC_INFERENCE_BATCH_WINDOW_MS = env_float("KYC_INFERENCE_BATCH_WINDOW_MS", default=5.0)
+KYC_COMPUTE_LIMITS = env_bool("KYC_COMPUTE_LIMITS", default=True)
+KYC_COMPUTE_THREADS = int(os.getenv("KYC_COMPUTE_THREADS", "0"))
+KYC_TF_INTRA_OP_THREADS = int(os.getenv("KYC_TF_INTRA_OP_THREADS", "0"))
+KYC_TF_INTER_OP_THREADS = int(os.getenv("KYC_TF_INTER_OP_THREADS", "1"))
+KYC_OPENCV_THREADS = int(os.getenv("KYC_OPENCV_THREADS", "0"))
+KYC_BLAS_THREADS = int(os.getenv("KYC_BLAS_THREADS", "0"))
+KYC_LIST_PAGE_SIZE = int(os.getenv("KYC_LIST_PAGE_SIZE", "50"))
+KYC_ROLLUP_LAG_SECONDS = env_float("KYC_ROLLUP_LAG_SECONDS", default=120.0)
+KYC_ROLLUP_REFRESH_DAYS = int(os.getenv("KYC_ROLLUP_REFRESH_DAYS", "3"))
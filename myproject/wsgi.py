@@ -4,3 +4,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
 
 application = get_wsgi_application()
+
+from kyc.services.mistral_ai import ensure_ocr_worker_started  # noqa: E402
+from kyc.services.warmup import start_warmup  # noqa: E402
+
+# A preloading gunicorn master must not start TensorFlow or worker threads
+# before it forks; `post_fork` in gunicorn_conf.py starts both in each worker.
+if os.getenv("GUNICORN_PRELOAD", "").strip().lower() not in {"1", "true", "yes", "on"}:
+    # Load face models in each serving process before it reports healthy, and
+    # drain OCR jobs left queued by the previous process.
+    start_warmup()
+    ensure_ocr_worker_started()